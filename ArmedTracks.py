@@ -0,0 +1,61 @@
+from __future__ import absolute_import, print_function, unicode_literals
+from builtins import object
+from functools import partial
+
+
+class ArmedTracks(object):
+    u"""The set of tracks of the song that are armed.
+
+    An arm listener on every track that can be armed keeps the set up to date,
+    so that questions like 'which tracks are armed' don't need to look at all
+    tracks of the song. 'on_arm_changed' is called with the track, after the set
+    was updated.
+    """
+
+    def __init__(self, song, on_arm_changed):
+        self.__song = song
+        self.__on_arm_changed = on_arm_changed
+        self.__arm_listeners = {}
+        self.__armed = set()
+        self.__song.add_tracks_listener(self.__on_tracks_changed)
+        self.__observe_tracks()
+
+    def disconnect(self):
+        self.__song.remove_tracks_listener(self.__on_tracks_changed)
+        for track, listener in list(self.__arm_listeners.items()):
+            track.remove_arm_listener(listener)
+        self.__arm_listeners = {}
+        self.__armed = set()
+
+    def is_armed(self, track):
+        return track in self.__armed
+
+    def armed_tracks(self):
+        return list(self.__armed)
+
+    def __observe_tracks(self):
+        armable_tracks = [t for t in self.__song.tracks if t.can_be_armed]
+        observed = set(armable_tracks)
+        for track in list(self.__arm_listeners):
+            if track not in observed:
+                listener = self.__arm_listeners.pop(track)
+                if track and track.arm_has_listener(listener):
+                    track.remove_arm_listener(listener)
+        self.__armed = set()
+        for track in armable_tracks:
+            if track not in self.__arm_listeners:
+                listener = partial(self.__on_track_arm_changed, track)
+                self.__arm_listeners[track] = listener
+                track.add_arm_listener(listener)
+            if track.arm:
+                self.__armed.add(track)
+
+    def __on_tracks_changed(self):
+        self.__observe_tracks()
+
+    def __on_track_arm_changed(self, track):
+        if track.arm:
+            self.__armed.add(track)
+        else:
+            self.__armed.discard(track)
+        self.__on_arm_changed(track)
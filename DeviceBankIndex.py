@@ -0,0 +1,122 @@
+from __future__ import absolute_import, print_function, unicode_literals
+from builtins import range
+from builtins import object
+
+from .OperatorBanks import OPERATOR_BANK_NAMES, OPERATOR_BANK_PARAMETER_NAMES, OPERATOR_BANKS, \
+    OPERATOR_CLASS_NAME, OPERATOR_PARAMETER_COUNT
+from .consts import *
+from _Generic.Devices import *
+
+
+class DeviceBankIndex(object):
+    u"""The parameter banks of one device, resolved to parameter objects.
+
+    DEVICE_DICT names the parameters of the banks of Live's devices; finding
+    them by name means walking the device's parameter list. Here every bank is
+    only resolved once (into NUM_CONTROLS_PER_ROW parameters, None for empty
+    strips), and the parameters are looked up by original name in a dict built once.
+    Operator uses the generated banks of OperatorBanks.py instead, which know
+    the positions of their parameters. The positions are checked against the
+    original names once; if they don't match (another Live version), the
+    parameters of those banks are looked up by name as well.
+
+    The device's parameter list is only fetched from Live once; the pages of
+    FX_ENCODER_MORE_PARAMETERS are windows into it. Throw the index away when
+    the parameters of the device change.
+    """
+
+    def __init__(self, device):
+        self.__device = device
+        self.__class_name = device.class_name
+        self.__parameters = None
+        self.__best_of_banks = DEVICE_DICT.get(self.__class_name)
+        self.__bank_names = BANK_NAME_DICT.get(self.__class_name)
+        self.__operator_banks = FX_OPERATOR_BANKS and self.__class_name == OPERATOR_CLASS_NAME
+        self.__position_banks = None
+        if self.__operator_banks:
+            self.__best_of_banks = OPERATOR_BANK_PARAMETER_NAMES
+            self.__bank_names = OPERATOR_BANK_NAMES
+            if self.__operator_positions_match():
+                self.__position_banks = OPERATOR_BANKS
+        self.__banks = {}
+        self.__parameters_by_name = None
+        self.__number_of_banks = None
+
+    def device(self):
+        return self.__device
+
+    def parameters(self):
+        u"""The parameters of the device, as fetched (once) from Live.
+        """
+        if self.__parameters is None:
+            self.__parameters = tuple(self.__device.parameters)
+        return self.__parameters
+
+    def has_best_of_banks(self):
+        u"""True if DEVICE_DICT (or OperatorBanks.py) defines the banks of this
+        kind of device.
+        """
+        return self.__best_of_banks is not None
+
+    def bank_names(self):
+        return self.__bank_names
+
+    def number_of_banks(self):
+        if self.__number_of_banks is None:
+            if self.__operator_banks:
+                self.__number_of_banks = len(self.__best_of_banks)
+            elif FX_ENCODER_MORE_PARAMETERS:
+                num_parameters = len(self.parameters())
+                self.__number_of_banks = num_parameters // 8 + (1 if num_parameters % 8 else 0)
+            else:
+                self.__number_of_banks = number_of_parameter_banks(self.__device)
+        return self.__number_of_banks
+
+    def bank(self, bank):
+        u"""Returns the parameters of the strips for 'bank'.
+        """
+        try:
+            return self.__banks[bank]
+        except KeyError:
+            parameters = self.__banks[bank] = self.__resolve_bank(bank)
+            return parameters
+
+    def __resolve_bank(self, bank):
+        if self.__position_banks is not None:
+            device_parameters = self.parameters()
+            if bank < len(self.__position_banks):
+                return tuple([device_parameters[index] for index in self.__position_banks[bank]])
+            return tuple([None for index in range(NUM_CONTROLS_PER_ROW)])
+        parameter_names = None
+        if (self.__operator_banks or not FX_ENCODER_MORE_PARAMETERS) and \
+                self.__best_of_banks and bank < len(self.__best_of_banks):
+            parameter_names = self.__best_of_banks[bank]
+        if parameter_names:
+            parameters_by_name = self.__get_parameters_by_name()
+            return tuple([parameters_by_name.get(parameter_names[index])
+                          for index in range(NUM_CONTROLS_PER_ROW)])
+        # skip 'Device On', without copying the list
+        device_parameters = self.parameters()
+        offset = 1 + NUM_CONTROLS_PER_ROW * bank
+        return tuple([device_parameters[offset + index] if offset + index < len(device_parameters) else None
+                      for index in range(NUM_CONTROLS_PER_ROW)])
+
+    def __operator_positions_match(self):
+        device_parameters = self.parameters()
+        if len(device_parameters) != OPERATOR_PARAMETER_COUNT:
+            return False
+        for indices, names in zip(OPERATOR_BANKS, OPERATOR_BANK_PARAMETER_NAMES):
+            for index, name in zip(indices, names):
+                if device_parameters[index].original_name != name:
+                    return False
+        return True
+
+    def __get_parameters_by_name(self):
+        if self.__parameters_by_name is None:
+            parameters_by_name = {}
+            for parameter in self.parameters():
+                # like get_parameter_by_name, match the original name (renamed
+                # macros keep theirs), and the first parameter with the name wins
+                parameters_by_name.setdefault(parameter.original_name, parameter)
+            self.__parameters_by_name = parameters_by_name
+        return self.__parameters_by_name
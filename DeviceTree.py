@@ -0,0 +1,176 @@
+from __future__ import absolute_import, print_function, unicode_literals
+from builtins import object
+
+
+class DeviceNode(object):
+    u"""Where one device sits in the device tree of its track.
+
+    Devices on the track itself have depth 0 and no parent; a device in a chain
+    of a rack has the node of that rack as parent, the index of the chain in the
+    rack's chains and a depth of one more than the rack.
+    """
+
+    def __init__(self, device, parent, top_level_index, chain_index, position, depth):
+        self.__device = device
+        self.__parent = parent
+        self.__top_level_index = top_level_index
+        self.__chain_index = chain_index
+        self.__position = position
+        self.__depth = depth
+        self.__chains = ()
+
+    def device(self):
+        return self.__device
+
+    def parent(self):
+        u"""The node of the rack this device is in, or None on the track itself.
+        """
+        return self.__parent
+
+    def rack(self):
+        return self.__parent.device() if self.__parent else None
+
+    def top_level_index(self):
+        u"""The index in the track's devices of this device, or of the rack
+        (on the track itself) it is nested in.
+        """
+        return self.__top_level_index
+
+    def chain_index(self):
+        u"""The index of the chain this device is in in the chains of its rack,
+        or None on the track itself.
+        """
+        return self.__chain_index
+
+    def position(self):
+        u"""The index of this device in the devices of its chain (or track).
+        """
+        return self.__position
+
+    def depth(self):
+        return self.__depth
+
+    def is_in_chain(self):
+        return self.__parent is not None
+
+    def chains(self):
+        u"""The chains of this device, if it is a rack.
+        """
+        return self.__chains
+
+    def set_chains(self, chains):
+        self.__chains = chains
+
+    def data_key(self):
+        u"""The prefix of the keys the track stores data of this device under:
+        the top level index, followed by the chain index for a device in a rack.
+        Deeper down, the position of each nested rack is added as well.
+        """
+        if self.__parent is None:
+            return str(self.__top_level_index)
+        return u'%s_%d' % (self.__parent.chain_data_key(), self.__chain_index)
+
+    def chain_data_key(self):
+        u"""The key the track stores the last selected chain of this rack under.
+        """
+        if self.__parent is None:
+            return str(self.__top_level_index)
+        return u'%s.%d' % (self.data_key(), self.__position)
+
+
+class DeviceTree(object):
+    u"""The devices of one track, with the racks and their chains walked down to
+    any depth, and a node per device that tells where it sits.
+
+    The tree is built on first use, and again after the devices of the track,
+    the chains of one of its racks or the devices of one of those chains
+    changed. The index of the track in song.tracks is kept the same way.
+    """
+
+    def __init__(self, song, track):
+        self.__song = song
+        self.__track = track
+        self.__track_index = None
+        self.__top_level_devices = None
+        self.__nodes = None
+        self.__observed_racks = []
+        self.__observed_chains = []
+        self.__song.add_tracks_listener(self.__on_song_tracks_changed)
+        self.__track.add_devices_listener(self.__on_devices_changed)
+
+    def disconnect(self):
+        self.__remove_tree_listeners()
+        if self.__song.tracks_has_listener(self.__on_song_tracks_changed):
+            self.__song.remove_tracks_listener(self.__on_song_tracks_changed)
+        if self.__track and self.__track.devices_has_listener(self.__on_devices_changed):
+            self.__track.remove_devices_listener(self.__on_devices_changed)
+
+    def track(self):
+        return self.__track
+
+    def track_index(self):
+        u"""The index of the track in song.tracks, or None for the return tracks
+        and the master track.
+        """
+        if self.__track_index is None:
+            self.__track_index = -1
+            for n, track in enumerate(self.__song.tracks):
+                if track == self.__track:
+                    self.__track_index = n
+                    break
+        return self.__track_index if self.__track_index >= 0 else None
+
+    def top_level_devices(self):
+        u"""The devices on the track itself.
+        """
+        if self.__nodes is None:
+            self.__update()
+        return self.__top_level_devices
+
+    def node(self, device):
+        u"""Returns the node of 'device', or None if it is not on this track.
+        """
+        if self.__nodes is None:
+            self.__update()
+        return self.__nodes.get(device)
+
+    def __update(self):
+        self.__remove_tree_listeners()
+        self.__nodes = {}
+        self.__top_level_devices = tuple(self.__track.devices)
+        for n, device in enumerate(self.__top_level_devices):
+            self.__add_node(device, None, n, None, n, 0)
+
+    def __add_node(self, device, parent, top_level_index, chain_index, position, depth):
+        node = DeviceNode(device, parent, top_level_index, chain_index, position, depth)
+        self.__nodes[device] = node
+        if type(device).__name__ == 'RackDevice':
+            chains = tuple(device.chains)
+            node.set_chains(chains)
+            device.add_chains_listener(self.__on_devices_changed)
+            self.__observed_racks.append(device)
+            for c, chain in enumerate(chains):
+                chain.add_devices_listener(self.__on_devices_changed)
+                self.__observed_chains.append(chain)
+                for p, chain_device in enumerate(chain.devices):
+                    self.__add_node(chain_device, node, top_level_index, c, p, depth + 1)
+
+    def __remove_tree_listeners(self):
+        # deleted racks and chains are False
+        for rack in self.__observed_racks:
+            if rack and rack.chains_has_listener(self.__on_devices_changed):
+                rack.remove_chains_listener(self.__on_devices_changed)
+        for chain in self.__observed_chains:
+            if chain and chain.devices_has_listener(self.__on_devices_changed):
+                chain.remove_devices_listener(self.__on_devices_changed)
+        self.__observed_racks = []
+        self.__observed_chains = []
+
+    def __on_devices_changed(self):
+        # the listeners of the tree are replaced on the next access, not from
+        # within their own notification
+        self.__nodes = None
+        self.__top_level_devices = None
+
+    def __on_song_tracks_changed(self):
+        self.__track_index = None
@@ -3,8 +3,15 @@ from builtins import str
 from builtins import range
 
 from .RemoteSLComponent import RemoteSLComponent
+from .MidiMessages import CLEAR_LEFT_DISPLAY_MESSAGE, CLEAR_RIGHT_DISPLAY_MESSAGE, display_text_message
+from .StripAbbreviator import strip_abbreviator
 from .consts import *
 
+LEFT_DISPLAY = 0
+RIGHT_DISPLAY = 1
+# header + (offset, row_id) + text command + sysex end
+DISPLAY_TEXT_SYSEX_OVERHEAD = len(DISPLAY_TEXT_SYSEX_HEADER) + 4
+
 class DisplayController(RemoteSLComponent):
     u"""Controls the 4 display rows of the RemoteSL.
     The left and right display can be individually controlled. Both displays will
@@ -14,10 +21,19 @@ class DisplayController(RemoteSLComponent):
 
     def __init__(self, remote_sl_parent):
         RemoteSLComponent.__init__(self, remote_sl_parent)
-        self.__left_strip_names = [ str() for x in range(NUM_CONTROLS_PER_ROW) ]
-        self.__left_strip_parameters = [ None for x in range(NUM_CONTROLS_PER_ROW) ]
-        self.__right_strip_names = [ str() for x in range(NUM_CONTROLS_PER_ROW) ]
-        self.__right_strip_parameters = [ None for x in range(NUM_CONTROLS_PER_ROW) ]
+        self.__strip_names = [ [ str() for x in range(NUM_CONTROLS_PER_ROW) ] for side in (LEFT_DISPLAY, RIGHT_DISPLAY) ]
+        self.__strip_parameters = [ [ None for x in range(NUM_CONTROLS_PER_ROW) ] for side in (LEFT_DISPLAY, RIGHT_DISPLAY) ]
+        self.__name_rows = [ None, None ]
+        self.__name_strips = [ [ None for x in range(NUM_CONTROLS_PER_ROW) ] for side in (LEFT_DISPLAY, RIGHT_DISPLAY) ]
+        self.__value_rows = [ None, None ]
+        self.__value_strips = [ [ None for x in range(NUM_CONTROLS_PER_ROW) ] for side in (LEFT_DISPLAY, RIGHT_DISPLAY) ]
+        self.__parameter_values = [ [ None for x in range(NUM_CONTROLS_PER_ROW) ] for side in (LEFT_DISPLAY, RIGHT_DISPLAY) ]
+        if MX_DISPLAY:
+            self.__displayed_sides = (LEFT_DISPLAY, RIGHT_DISPLAY)
+            self.__row_sides = (None, LEFT_DISPLAY, RIGHT_DISPLAY, LEFT_DISPLAY, RIGHT_DISPLAY)
+        else:
+            self.__displayed_sides = (LEFT_DISPLAY,)
+            self.__row_sides = (None, LEFT_DISPLAY, LEFT_DISPLAY, LEFT_DISPLAY, LEFT_DISPLAY)
         self.refresh_state()
 
     def disconnect(self):
@@ -30,10 +46,7 @@ class DisplayController(RemoteSLComponent):
         'names' can be an array of NUM_CONTROLS_PER_ROW strings, or a list with
         exactly one string, which then will fill up the whole display
         """
-        assert len(parameters) == NUM_CONTROLS_PER_ROW
-        assert len(names) == NUM_CONTROLS_PER_ROW or len(names) == 1
-        self.__left_strip_names = names
-        self.__left_strip_parameters = parameters
+        self.__setup_display(LEFT_DISPLAY, names, parameters)
 
     def setup_right_display(self, names, parameters):
         u"""Shows the given strings on the upper right row, the parameters values
@@ -42,69 +55,101 @@ class DisplayController(RemoteSLComponent):
         'names' can be an array of NUM_CONTROLS_PER_ROW strings, or a list with
         exactly one string, which then will fill up the whole display
         """
+        self.__setup_display(RIGHT_DISPLAY, names, parameters)
+
+    def set_right_display_name(self, index, name):
+        u"""Changes the name of one strip of the upper right row, leaving all
+        others as they are.
+        """
+        self.__set_strip_name(RIGHT_DISPLAY, index, name)
+
+    def __setup_display(self, side, names, parameters):
         assert len(parameters) == NUM_CONTROLS_PER_ROW
         assert len(names) == NUM_CONTROLS_PER_ROW or len(names) == 1
-        self.__right_strip_names = names
-        self.__right_strip_parameters = parameters
+        if list(names) != self.__strip_names[side]:
+            self.__strip_names[side] = list(names)
+            self.__name_strips[side] = [ None for x in range(NUM_CONTROLS_PER_ROW) ]
+            self.__name_rows[side] = None
+        strip_parameters = self.__strip_parameters[side]
+        for index, parameter in enumerate(parameters):
+            if strip_parameters[index] != parameter:
+                strip_parameters[index] = parameter
+                self.__value_strips[side][index] = None
+
+    def __set_strip_name(self, side, index, name):
+        strip_names = self.__strip_names[side]
+        assert len(strip_names) == NUM_CONTROLS_PER_ROW
+        if strip_names[index] != name:
+            strip_names[index] = name
+            self.__name_strips[side][index] = None
+            self.__name_rows[side] = None
 
     def update_display(self):
+        u"""Only strips that changed since the last call are rendered again, and
+        only rows whose text changed are sent.
+        """
+        for side in self.__displayed_sides:
+            self.__update_name_row(side)
+            self.__update_value_row(side)
         for row_id in (1, 2, 3, 4):
-            message_string = u''
+            side = self.__row_sides[row_id]
             if row_id == 1 or row_id == 2:
-                if row_id == 1:
-                    strip_names = self.__left_strip_names
-                else:
-                    if MX_DISPLAY:
-                        strip_names = self.__right_strip_names
-                if len(strip_names) == NUM_CONTROLS_PER_ROW:
-                    for s in strip_names:
-                        message_string += self.__generate_strip_string(s)
-                else:
-                    assert len(strip_names) == 1
-                    message_string += strip_names[0]
-            elif row_id == 3 or row_id == 4:
-                if row_id == 3:
-                    parameters = self.__left_strip_parameters
-                else:
-                    if MX_DISPLAY:
-                        parameters = self.__right_strip_parameters
-                assert len(parameters) == NUM_CONTROLS_PER_ROW
-                for p in parameters:
-                    if p:
-                        message_string += self.__generate_strip_string(str(p))
-                    else:
-                        message_string += self.__generate_strip_string(u'')
-
+                message_string = self.__name_rows[side]
             else:
-                assert False
+                message_string = self.__value_rows[side]
             self.__send_display_string(message_string, row_id, offset=0)
 
     def refresh_state(self):
         self.__last_send_row_id_messages = [None,
-         [],
-         [],
-         [],
-         []]
+         None,
+         None,
+         None,
+         None]
+        self.__last_send_row_texts = [None,
+         None,
+         None,
+         None,
+         None]
+
+    def __update_name_row(self, side):
+        if self.__name_rows[side] is None:
+            strip_names = self.__strip_names[side]
+            if len(strip_names) == NUM_CONTROLS_PER_ROW:
+                name_strips = self.__name_strips[side]
+                for index, name in enumerate(strip_names):
+                    if name_strips[index] is None:
+                        name_strips[index] = strip_abbreviator.generate(name)
+                self.__name_rows[side] = u''.join(name_strips)
+            else:
+                assert len(strip_names) == 1
+                self.__name_rows[side] = strip_names[0]
+
+    def __update_value_row(self, side):
+        u"""Renders a value strip again when its parameter was changed, or its
+        value differs from the one it was last rendered with.
+        """
+        value_strips = self.__value_strips[side]
+        parameter_values = self.__parameter_values[side]
+        for index, p in enumerate(self.__strip_parameters[side]):
+            if p:
+                value = p.value
+                if value_strips[index] is None or parameter_values[index] != value:
+                    parameter_values[index] = value
+                    value_strips[index] = strip_abbreviator.generate(str(p))
+                    self.__value_rows[side] = None
+            elif value_strips[index] is None:
+                parameter_values[index] = None
+                value_strips[index] = strip_abbreviator.generate(u'')
+                self.__value_rows[side] = None
+        if self.__value_rows[side] is None:
+            self.__value_rows[side] = u''.join(value_strips)
 
     def __send_clear_displays(self):
-        start_clear_sysex = (240, 0, 32, 41, 3, 3, 18, 0)
-        left_end_sysex = (ABLETON_PID,
-         0,
-         2,
-         2,
-         4,
-         247)
-        right_end_sysex = (ABLETON_PID,
-         0,
-         2,
-         2,
-         5,
-         247)
-        self.send_midi(start_clear_sysex + left_end_sysex)
-        self.send_midi(start_clear_sysex + right_end_sysex)
+        self.send_midi(CLEAR_LEFT_DISPLAY_MESSAGE)
+        self.send_midi(CLEAR_RIGHT_DISPLAY_MESSAGE)
 
     def __send_display_string(self, message, row_id, offset = 0):
-        u"""Sends a sysex to update a complete row.
+        u"""Sends sysex to update a row.
         
         'message' must be smaller than NUM_CHARS_PER_DISPLAY_LINE,
         'offset' can be something form 0 to NUM_CHARS_PER_DISPLAY_LINE - 1
@@ -112,67 +157,47 @@ class DisplayController(RemoteSLComponent):
         
         'row_id' is defined as followed: left_row1 = 1 | left_row2 = 2
            left_row1 = 3] | left_row2 = 4
+        
+        With DISPLAY_PARTIAL_UPDATES, only the parts of the row that differ from
+        the last sent text are written, when that takes less bytes than writing
+        the complete row. After a refresh the complete row is always written.
         """
         assert row_id in (1, 2, 3, 4)
+        if self.__last_send_row_id_messages[row_id] == (message, offset):
+            return
+        self.__last_send_row_id_messages[row_id] = (message, offset)
         final_message = u' ' * offset + message
         if len(final_message) < NUM_CHARS_PER_DISPLAY_LINE:
             fill_up = NUM_CHARS_PER_DISPLAY_LINE - len(final_message)
             final_message = final_message + u' ' * fill_up
         elif len(final_message) >= NUM_CHARS_PER_DISPLAY_LINE:
             final_message = final_message[0:NUM_CHARS_PER_DISPLAY_LINE]
-        final_offset = 0
-        sysex_header = (240,
-         0,
-         32,
-         41,
-         3,
-         3,
-         18,
-         0,
-         ABLETON_PID,
-         0,
-         2,
-         1)
-        sysex_pos = (final_offset, row_id)
-        sysex_text_command = (4,)
-        sysex_text = tuple([ ord(c) for c in final_message ])
-        sysex_close_up = (247,)
-        full_sysex = sysex_header + sysex_pos + sysex_text_command + sysex_text + sysex_close_up
-        if self.__last_send_row_id_messages[row_id] != full_sysex:
-            self.__last_send_row_id_messages[row_id] = full_sysex
-            self.send_midi(full_sysex)
-
-    def __generate_strip_string(self, display_string):
-        u""" Hack: Shamelessly stolen from the MainDisplayController of the Mackie Control.
-        Should share this in future in a 'Common' package!
-        
-        returns a 6 char string for of the passed string, trying to remove not so important
-        letters and signs first...
-        """
-        if not display_string:
-            return u' ' * NUM_CHARS_PER_DISPLAY_STRIP
-        if len(display_string.strip()) > NUM_CHARS_PER_DISPLAY_STRIP - 1 and display_string.endswith(u'dB') and display_string.find(u'.') != -1:
-            display_string = display_string[:-2]
-        if len(display_string) > NUM_CHARS_PER_DISPLAY_STRIP - 1:
-            for um in [u' ',
-             u'i',
-             u'o',
-             u'u',
-             u'e',
-             u'a']:
-                while len(display_string) > NUM_CHARS_PER_DISPLAY_STRIP - 1 and display_string.rfind(um, 1) != -1:
-                    um_pos = display_string.rfind(um, 1)
-                    display_string = display_string[:um_pos] + display_string[um_pos + 1:]
+        last_message = self.__last_send_row_texts[row_id]
+        if last_message == final_message:
+            return
+        self.__last_send_row_texts[row_id] = final_message
+        if DISPLAY_PARTIAL_UPDATES and last_message is not None:
+            spans = self.__changed_spans(last_message, final_message)
+            spans_size = sum([ DISPLAY_TEXT_SYSEX_OVERHEAD + end - start for start, end in spans ])
+            if spans_size < DISPLAY_TEXT_SYSEX_OVERHEAD + NUM_CHARS_PER_DISPLAY_LINE:
+                for start, end in spans:
+                    self.__send_display_text(final_message[start:end], row_id, start)
+                return
+        self.__send_display_text(final_message, row_id, 0)
 
-        else:
-            display_string = display_string.center(NUM_CHARS_PER_DISPLAY_STRIP - 1)
-        ret = u''
-        for i in range(NUM_CHARS_PER_DISPLAY_STRIP - 1):
-            if ord(display_string[i]) > 127 or ord(display_string[i]) < 0:
-                ret += u' '
-            else:
-                ret += display_string[i]
+    def __changed_spans(self, old_text, new_text):
+        u"""Returns the (start, end) ranges in which both texts differ. Ranges that
+        are separated by less unchanged characters than the overhead of another
+        sysex are merged.
+        """
+        spans = []
+        for index in range(len(new_text)):
+            if old_text[index] != new_text[index]:
+                if spans and index - spans[-1][1] < DISPLAY_TEXT_SYSEX_OVERHEAD:
+                    spans[-1][1] = index + 1
+                else:
+                    spans.append([index, index + 1])
+        return spans
 
-        ret += u' '
-        assert len(ret) == NUM_CHARS_PER_DISPLAY_STRIP
-        return ret
+    def __send_display_text(self, text, row_id, offset):
+        self.send_midi(display_text_message(text, row_id, offset))
@@ -3,11 +3,18 @@ from builtins import str
 from builtins import range
 from builtins import object
 
+from functools import partial
 from past.utils import old_div
 import Live
 import json
 
 from .RemoteSLComponent import RemoteSLComponent
+from .MidiMessages import cc_message
+from .Instrumentation import timed
+from .MidiRouter import TABLE_SIZE, create_handler_table, on_value, unexpected
+from .DeviceBankIndex import DeviceBankIndex
+from .DeviceTree import DeviceTree
+from .SnapshotIndex import SnapshotIndex
 from .consts import *
 from _Generic.Devices import *
 
@@ -30,9 +37,10 @@ class EffectController(RemoteSLComponent):
         self.__display_controller = display_controller
         self.__parent = remote_sl_parent
         self.__selected_track = None
-        self.__selected_track_index = None
+        self.__device_tree = None
+        self.__snapshots = None
         self.__assigned_device = None
-        self.__assigned_device_index = None
+        self.__bank_index = None
         self.__assigned_device_is_locked = False
         self.__transport_locked = False
         self.__change_assigned_device(self.__parent.song().appointed_device)
@@ -40,11 +48,15 @@ class EffectController(RemoteSLComponent):
         self.__show_bank = False
         self.__strips = [EffectChannelStrip(self, x)
                          for x in range(NUM_CONTROLS_PER_ROW)]
+        self.__cc_handlers = self.__create_cc_handlers()
         self.song().view.add_selected_track_listener(self.__device_changed)
         self.__reassign_strips()
 
     def disconnect(self):
         self.__change_assigned_device(None)
+        if self.__device_tree:
+            self.__device_tree.disconnect()
+            self.__device_tree = None
 
     def remote_sl_parent(self):
         return self.__parent
@@ -52,14 +64,25 @@ class EffectController(RemoteSLComponent):
     def remote_sl_selected_track(self):
         return self.__selected_track
 
-    def remote_sl_selected_track_index(self):
-        return self.__selected_track_index
-
     def remote_sl_assigned_device(self):
         return self.__assigned_device
 
-    def remote_sl_assigned_device_index(self):
-        return self.__assigned_device_index
+    def remote_sl_device_tree(self):
+        return self.__device_tree
+
+    def remote_sl_snapshots(self):
+        return self.__snapshots
+
+    def remote_sl_snapshot_device_key(self):
+        u"""The key the selected track stores the snapshots of the assigned
+        device under, or None if the device is not on the selected track.
+        """
+        node = self.__assigned_device_node()
+        if node is None:
+            return None
+        if FX_LOWER_BUTTON_ROW_DEVICE_CHILDS:
+            return node.data_key()
+        return str(node.top_level_index())
 
     def remote_sl_transport_locked(self):
         return self.__transport_locked
@@ -67,36 +90,11 @@ class EffectController(RemoteSLComponent):
     def remote_sl_reassign_strips(self):
         return self.__reassign_strips()
 
-    def remote_sl_count(self):
-        return self.__count()
-
     def receive_midi_cc(self, cc_no, cc_value):
-        if cc_no in fx_display_button_ccs:
-            self.__handle_param_page_up_down_ccs(cc_no, cc_value)
-        elif cc_no in fx_select_button_ccs:
-            self.__handle_select_button_ccs(cc_no, cc_value)
-        elif cc_no in fx_upper_button_row_ccs:
-            strip = self.__strips[cc_no - FX_UPPER_BUTTON_ROW_BASE_CC]
-            if cc_value == CC_VAL_BUTTON_PRESSED:
-                strip.on_upper_button_pressed()
-        elif cc_no in fx_lower_button_row_ccs:
-            if FX_LOWER_BUTTON_ROW_DEVICE:
-                strip = self.__strips[cc_no - FX_LOWER_BUTTON_ROW_BASE_CC]
-                if cc_value == 127:
-                    strip.on_lower_button_pressed()
-            else:
-                assert False, u'Lower Button CCS should be passed to Live!'
-        elif cc_no in fx_encoder_row_ccs:
-            strip = self.__strips[cc_no - FX_ENCODER_ROW_BASE_CC]
-            strip.on_encoder_moved(cc_value)
-        elif cc_no in ts_ccs:
-            self.__handle_transport_ccs(cc_no, cc_value)
-        elif cc_no in mx_display_button_ccs:
-            self.__handle_device_page_up_down_ccs(cc_no, cc_value)
-        elif cc_no in fx_poti_row_ccs:
-            assert False, u'Poti CCS should be passed to Live!'
-        else:
-            assert False, u'unknown FX midi message'
+        self.__cc_handlers[cc_no](cc_value)
+
+    def cc_handler(self, cc_no):
+        return self.__cc_handlers[cc_no]
 
     def receive_midi_note(self, note, velocity):
         if note in fx_drum_pad_row_notes:
@@ -104,6 +102,38 @@ class EffectController(RemoteSLComponent):
         else:
             assert False, u'unknown FX midi message'
 
+    def note_handler(self, note):
+        return partial(self.receive_midi_note, note)
+
+    def __create_cc_handlers(self):
+        u"""Resolves every CC once to the function that handles it, in the same
+        order of precedence as the rows are defined in consts.
+        """
+        def lower_button_handler(cc_no):
+            if FX_LOWER_BUTTON_ROW_DEVICE:
+                strip = self.__strips[cc_no - FX_LOWER_BUTTON_ROW_BASE_CC]
+                return on_value(127, strip.on_lower_button_pressed)
+            return unexpected(u'Lower Button CCS should be passed to Live!')
+
+        return create_handler_table([
+            (fx_display_button_ccs, lambda cc_no: partial(
+                self.__handle_param_page_up_down_ccs, cc_no)),
+            (fx_select_button_ccs, lambda cc_no: partial(
+                self.__handle_select_button_ccs, cc_no)),
+            (fx_upper_button_row_ccs, lambda cc_no: on_value(
+                CC_VAL_BUTTON_PRESSED, self.__strips[cc_no - FX_UPPER_BUTTON_ROW_BASE_CC].on_upper_button_pressed)),
+            (fx_lower_button_row_ccs, lower_button_handler),
+            (fx_encoder_row_ccs, lambda cc_no:
+                self.__strips[cc_no - FX_ENCODER_ROW_BASE_CC].on_encoder_moved),
+            (ts_ccs, lambda cc_no: partial(
+                self.__handle_transport_ccs, cc_no)),
+            (mx_display_button_ccs, lambda cc_no: partial(
+                self.__handle_device_page_up_down_ccs, cc_no)),
+            (fx_poti_row_ccs, lambda cc_no: unexpected(
+                u'Poti CCS should be passed to Live!')),
+            (range(TABLE_SIZE), lambda cc_no: unexpected(
+                u'unknown FX midi message'))])
+
     def build_midi_map(self, script_handle, midi_map_handle):
         needs_takeover = True
         for s in self.__strips:
@@ -128,14 +158,14 @@ class EffectController(RemoteSLComponent):
                     if FX_ENCODER_ON_DEVICE_ACTIVE:
                         if self.__assigned_device.is_active:
                             self.send_midi(
-                                (self.cc_status_byte(), fx_encoder_led_mode_ccs[strip_index], ring_mode_value))
+                                cc_message(fx_encoder_led_mode_ccs[strip_index], ring_mode_value))
                             Live.MidiMap.map_midi_cc_with_feedback_map(
                                 midi_map_handle, parameter, SL_MIDI_CHANNEL, cc_no, map_mode, feedback_rule, not needs_takeover)
                             Live.MidiMap.send_feedback_for_parameter(
                                 midi_map_handle, parameter)
                     else:
                         self.send_midi(
-                            (self.cc_status_byte(), fx_encoder_led_mode_ccs[strip_index], ring_mode_value))
+                            cc_message(fx_encoder_led_mode_ccs[strip_index], ring_mode_value))
                         Live.MidiMap.map_midi_cc_with_feedback_map(
                             midi_map_handle, parameter, SL_MIDI_CHANNEL, cc_no, map_mode, feedback_rule, not needs_takeover)
                         Live.MidiMap.send_feedback_for_parameter(
@@ -145,10 +175,10 @@ class EffectController(RemoteSLComponent):
                         midi_map_handle, parameter, SL_MIDI_CHANNEL, cc_no, map_mode, not needs_takeover)
             else:
                 if self.support_mkII():
-                    self.send_midi((
-                        self.cc_status_byte(), fx_encoder_led_mode_ccs[strip_index], 0))
-                    self.send_midi((
-                        self.cc_status_byte(), fx_encoder_feedback_ccs[strip_index], 0))
+                    self.send_midi(
+                        cc_message(fx_encoder_led_mode_ccs[strip_index], 0))
+                    self.send_midi(
+                        cc_message(fx_encoder_feedback_ccs[strip_index], 0))
                 Live.MidiMap.forward_midi_cc(
                     script_handle, midi_map_handle, SL_MIDI_CHANNEL, cc_no)
 
@@ -160,126 +190,93 @@ class EffectController(RemoteSLComponent):
             Live.MidiMap.forward_midi_note(
                 script_handle, midi_map_handle, SL_MIDI_CHANNEL, note)
 
+    def midi_map_signature(self):
+        u"""The mapped parameter of every encoder, and whether it is mapped with
+        (and which) feedback.
+        """
+        feedback = self.support_mkII()
+        if feedback and FX_ENCODER_ON_DEVICE_ACTIVE and self.__assigned_device:
+            feedback = self.__assigned_device.is_active
+        return (feedback, tuple([s.assigned_parameter() for s in self.__strips]))
+
     def refresh_state(self):
         self.__update_select_row_leds()
         self.__reassign_strips()
 
+    @timed(u'EffectController.reassign_strips')
     def __reassign_strips(self):
         self.__selected_track = self.__parent.song().view.selected_track
-        for n, track in enumerate(self.__parent.song().tracks):
-            if track == self.__selected_track:
-                self.__selected_track_index = n
-                break
-        devices = self.__selected_track.devices
-        assigned_device_parent_type = None
-        if self.__assigned_device:
-            assigned_device_parent_type = type(
-                self.__assigned_device.canonical_parent).__name__
-            if assigned_device_parent_type == 'Chain' or assigned_device_parent_type == 'DrumChain':
-                assigned_device = self.__assigned_device.canonical_parent.canonical_parent
-            else:
-                assigned_device = self.__assigned_device
-            for n, device in enumerate(devices):
-                if device == assigned_device:
-                    self.__assigned_device_index = n
-                    break
-        else:
-            self.__assigned_device_index = None
+        if self.__device_tree is None or self.__device_tree.track() != self.__selected_track:
+            if self.__device_tree:
+                self.__device_tree.disconnect()
+            self.__device_tree = DeviceTree(self.song(), self.__selected_track)
+            self.__snapshots = SnapshotIndex(self.__selected_track)
+        devices = self.__device_tree.top_level_devices()
+        node = self.__assigned_device_node()
 
         if FX_LOWER_BUTTON_ROW_DEVICE:
             if FX_LOWER_BUTTON_ROW_DEVICE_ALL:
                 for n in range(NUM_CONTROLS_PER_ROW):
                     if n < len(devices):
                         self.send_midi(
-                            (self.cc_status_byte(), FX_LOWER_BUTTON_ROW_BASE_CC + n, 1))
+                            cc_message(FX_LOWER_BUTTON_ROW_BASE_CC + n, 1))
                     else:
                         self.send_midi(
-                            (self.cc_status_byte(), FX_LOWER_BUTTON_ROW_BASE_CC + n, 0))
+                            cc_message(FX_LOWER_BUTTON_ROW_BASE_CC + n, 0))
             else:
+                # the device, or the rack on the track it is nested in
                 for n in range(NUM_CONTROLS_PER_ROW):
-                    if n < len(devices) and self.__assigned_device:
-                        if assigned_device_parent_type == 'Chain' or assigned_device_parent_type == 'DrumChain':
-                            device = self.__assigned_device.canonical_parent.canonical_parent
-                        else:
-                            device = self.__assigned_device
-                        if device == devices[n]:
-                            self.send_midi(
-                                (self.cc_status_byte(), FX_LOWER_BUTTON_ROW_BASE_CC + n, 1))
-                        else:
-                            self.send_midi(
-                                (self.cc_status_byte(), FX_LOWER_BUTTON_ROW_BASE_CC + n, 0))
+                    if node and node.top_level_index() == n:
+                        self.send_midi(
+                            cc_message(FX_LOWER_BUTTON_ROW_BASE_CC + n, 1))
                     else:
                         self.send_midi(
-                            (self.cc_status_byte(), FX_LOWER_BUTTON_ROW_BASE_CC + n, 0))
+                            cc_message(FX_LOWER_BUTTON_ROW_BASE_CC + n, 0))
 
-            # self.log('', f'·[TRACK] {self.__selected_track.name}')
-            # if self.__assigned_device:
-            #     self.log(f'[DEVICE] {self.__assigned_device.name}')
+            if self.log_enabled(LOG_DEBUG):
+                self.log('', f'·[TRACK] {self.__selected_track.name}', level=LOG_DEBUG)
+                if self.__assigned_device:
+                    self.log(f'[DEVICE] {self.__assigned_device.name}', level=LOG_DEBUG)
 
         if self.__transport_locked:
+            count = self.__count()
             for n in range(NUM_CONTROLS_PER_ROW):
-                if n < self.__count():
+                if n < count:
                     self.send_midi(
-                        (self.cc_status_byte(), FX_UPPER_BUTTON_ROW_BASE_CC + n, 1))
+                        cc_message(FX_UPPER_BUTTON_ROW_BASE_CC + n, 1))
                 else:
                     self.send_midi(
-                        (self.cc_status_byte(), FX_UPPER_BUTTON_ROW_BASE_CC + n, 0))
+                        cc_message(FX_UPPER_BUTTON_ROW_BASE_CC + n, 0))
         else:
             for n in range(8):
                 self.send_midi(
-                    (self.cc_status_byte(), FX_UPPER_BUTTON_ROW_BASE_CC + n, 0))
+                    cc_message(FX_UPPER_BUTTON_ROW_BASE_CC + n, 0))
 
         page_up_value = CC_VAL_BUTTON_RELEASED
         page_down_value = CC_VAL_BUTTON_RELEASED
         if self.__assigned_device:
-            param_index = 0
-            param_banks = 0
-            chosen_bank = 0
             param_names = []
             parameters = []
-            if FX_ENCODER_MORE_PARAMETERS:
-                chosen_bank = True
-            else:
-                if list(DEVICE_DICT.keys()).count(self.__assigned_device.class_name) > 0:
-                    param_banks = DEVICE_DICT[self.__assigned_device.class_name]
-                    chosen_bank = param_banks[self.__bank]
-            for s in self.__strips:
-                param = None
+            for s, param in zip(self.__strips, self.__bank_index.bank(self.__bank)):
                 name = u''
-                if chosen_bank:
-                    if FX_ENCODER_MORE_PARAMETERS:
-                        if param_index + 8 * self.__bank < len(self.__assigned_device.parameters[1:]):
-                            param = self.__assigned_device.parameters[1:][param_index + 8 * self.__bank]
-                        else:
-                            param = None
-                    else:
-                        param = get_parameter_by_name(
-                            self.__assigned_device, chosen_bank[param_index])
-                else:
-                    new_index = param_index + 8 * self.__bank
-                    device_parameters = self.__assigned_device.parameters[1:]
-                    if new_index < len(device_parameters):
-                        param = device_parameters[new_index]
                 if param:
                     name = param.name
                 s.set_assigned_parameter(param)
                 parameters.append(param)
                 param_names.append(name)
-                param_index += 1
 
             if self.support_mkII() and FX_ENCODER_ON_DEVICE_ACTIVE:
                 if not self.__assigned_device.is_active:
                     for s in self.__strips:
                         strip_index = self.__strips.index(s)
                         self.send_midi(
-                            (self.cc_status_byte(), fx_encoder_led_mode_ccs[strip_index], 0))
+                            cc_message(fx_encoder_led_mode_ccs[strip_index], 0))
                         self.send_midi(
-                            (self.cc_status_byte(), fx_encoder_feedback_ccs[strip_index], 0))
+                            cc_message(fx_encoder_feedback_ccs[strip_index], 0))
 
             if self.__bank > 0:
                 page_down_value = CC_VAL_BUTTON_PRESSED
-            if self.__bank + 1 < self.__number_of_parameter_banks(self.__assigned_device,
-                                                                  more=FX_ENCODER_MORE_PARAMETERS):
+            if self.__bank + 1 < self.__bank_index.number_of_banks():
                 page_up_value = CC_VAL_BUTTON_PRESSED
             self.__report_bank()
         else:
@@ -293,72 +290,53 @@ class EffectController(RemoteSLComponent):
 
         if self.support_mkII():
             self.send_midi(
-                (self.cc_status_byte(), FX_DISPLAY_PAGE_DOWN, page_down_value))
+                cc_message(FX_DISPLAY_PAGE_DOWN, page_down_value))
             self.send_midi(
-                (self.cc_status_byte(), FX_DISPLAY_PAGE_UP, page_up_value))
+                cc_message(FX_DISPLAY_PAGE_UP, page_up_value))
 
             if MX_DISPLAY_PAGE_DEVICE_CHILDS:
                 page_up_value = CC_VAL_BUTTON_RELEASED
                 page_down_value = CC_VAL_BUTTON_RELEASED
-                if assigned_device_parent_type == 'Chain' or assigned_device_parent_type == 'DrumChain':
-                    rack_device = self.__assigned_device.canonical_parent.canonical_parent
-                    if rack_device.chains and len(rack_device.chains) > 1:
-                        selected_chain = rack_device.view.selected_chain
-                        selected_chain_index = list(
-                            rack_device.chains).index(selected_chain)
+                if node and node.is_in_chain():
+                    chains = node.parent().chains()
+                    if len(chains) > 1:
+                        selected_chain_index = chains.index(
+                            node.rack().view.selected_chain)
                         if selected_chain_index > 0:
                             page_down_value = CC_VAL_BUTTON_PRESSED
-                        if selected_chain_index < len(rack_device.chains) - 1:
+                        if selected_chain_index < len(chains) - 1:
                             page_up_value = CC_VAL_BUTTON_PRESSED
                         self.send_midi(
-                            (self.cc_status_byte(), MX_DISPLAY_PAGE_UP, page_up_value))
+                            cc_message(MX_DISPLAY_PAGE_UP, page_up_value))
                         self.send_midi(
-                            (self.cc_status_byte(), MX_DISPLAY_PAGE_DOWN, page_down_value))
+                            cc_message(MX_DISPLAY_PAGE_DOWN, page_down_value))
 
                         self.send_midi(
-                            (self.cc_status_byte(), FX_SELECT_LOWER_BUTTON_ROW, 1))
+                            cc_message(FX_SELECT_LOWER_BUTTON_ROW, 1))
 
                 else:
                     self.send_midi(
-                        (self.cc_status_byte(), MX_DISPLAY_PAGE_UP, page_up_value))
+                        cc_message(MX_DISPLAY_PAGE_UP, page_up_value))
                     self.send_midi(
-                        (self.cc_status_byte(), MX_DISPLAY_PAGE_DOWN, page_down_value))
+                        cc_message(MX_DISPLAY_PAGE_DOWN, page_down_value))
 
                     self.send_midi(
-                        (self.cc_status_byte(), FX_SELECT_LOWER_BUTTON_ROW, 0))
-
-    def __count(self):
-        assigned_device_parent = self.__assigned_device.canonical_parent
-        assigned_device_parent_type = type(
-            self.__assigned_device.canonical_parent).__name__
-
-        assigned_device_chain_n = None
-        if assigned_device_parent_type == 'Chain' or assigned_device_parent_type == 'DrumChain':
-            rack_device = self.__assigned_device.canonical_parent.canonical_parent
-            for n, chain in enumerate(rack_device.chains):
-                if chain == assigned_device_parent:
-                    # Make a string, otherwise None = 0
-                    assigned_device_chain_n = str(n)
-        count = 0
-        for n in range(8):
-            if assigned_device_chain_n:
-                snapshot_key = f'{str(self.__assigned_device_index)}_{assigned_device_chain_n}_{str(n)}'
-            else:
-                snapshot_key = f'{str(self.__assigned_device_index)}_{str(n)}'
-            snapshot_data = self.__selected_track.get_data(snapshot_key, None)
-            if snapshot_data:
-                count += 1
-            else:
-                return count
+                        cc_message(FX_SELECT_LOWER_BUTTON_ROW, 0))
 
-    def __number_of_parameter_banks(self, device, more=False):
-        if more:
-            def ceil(number):
-                return int(number) + (number % 1 > 0)
+    def __assigned_device_node(self):
+        u"""Where the assigned device sits on the selected track, None if it is
+        not on that track. Looked up on every use, the tree of the track is
+        rebuilt after its racks changed.
+        """
+        if self.__assigned_device is None or self.__device_tree is None:
+            return None
+        return self.__device_tree.node(self.__assigned_device)
 
-            return ceil(len(list(device.parameters)) / 8)
-        else:
-            return number_of_parameter_banks(device)
+    def __count(self):
+        device_key = self.remote_sl_snapshot_device_key()
+        if device_key is None:
+            return 0
+        return self.__snapshots.count(device_key)
 
     def __handle_param_page_up_down_ccs(self, cc_no, cc_value):
         if self.__assigned_device:
@@ -366,8 +344,7 @@ class EffectController(RemoteSLComponent):
             if cc_value == CC_VAL_BUTTON_PRESSED:
                 if cc_no == FX_DISPLAY_PAGE_UP:
                     new_bank = min(
-                        self.__bank + 1, self.__number_of_parameter_banks(self.__assigned_device, 
-                                                                          more=FX_ENCODER_MORE_PARAMETERS) - 1)
+                        self.__bank + 1, self.__bank_index.number_of_banks() - 1)
                 elif cc_no == FX_DISPLAY_PAGE_DOWN:
                     new_bank = max(self.__bank - 1, 0)
                 else:
@@ -382,50 +359,51 @@ class EffectController(RemoteSLComponent):
                         self.__parent.instance_identifier(), new_bank)
 
     def __handle_device_page_up_down_ccs(self, cc_no, cc_value):
-        if cc_value == CC_VAL_BUTTON_PRESSED and self.__assigned_device:
+        node = self.__assigned_device_node()
+        if cc_value == CC_VAL_BUTTON_PRESSED and node:
             assigned_device_parent_type = type(
                 self.__assigned_device.canonical_parent).__name__
-            if assigned_device_parent_type == 'Chain' or assigned_device_parent_type == 'DrumChain':
-                rack_device = self.__assigned_device.canonical_parent.canonical_parent
-                assigned_device_index = str(self.__assigned_device_index)
-                if rack_device.chains and len(rack_device.chains) > 1:
+            if node.is_in_chain():
+                rack_device = node.rack()
+                chain_data_key = node.parent().chain_data_key()
+                chains = node.parent().chains()
+                if len(chains) > 1:
                     selected_chain = rack_device.view.selected_chain
-                    selected_chain_index = list(
-                        rack_device.chains).index(selected_chain)
+                    selected_chain_index = chains.index(selected_chain)
                     if cc_no == MX_DISPLAY_PAGE_DOWN:
                         if selected_chain_index > 0:
                             new_index = selected_chain_index - 1
                             if assigned_device_parent_type == 'Chain' and rack_device.class_name != 'MidiEffectGroupDevice':
-                                for chain in rack_device.chains: 
+                                for chain in chains: 
                                     chain.devices[0].parameters[0].value = chain.devices[0].parameters[0].min
                                     chain.solo = False
-                                rack_device.chains[new_index].devices[0].parameters[0].value = chain.devices[0].parameters[0].max
-                                rack_device.chains[new_index].solo = True
+                                chains[new_index].devices[0].parameters[0].value = chain.devices[0].parameters[0].max
+                                chains[new_index].solo = True
                             self.song().view.select_device(
-                                rack_device.chains[new_index].devices[0], True)
+                                chains[new_index].devices[0], True)
                             self.__reassign_strips()
                             self.__selected_track.set_data(
-                                assigned_device_index, new_index)
+                                chain_data_key, new_index)
                             if not self.__transport_locked:
-                                self.send_midi((self.cc_status_byte(
-                                ), FX_UPPER_BUTTON_ROW_BASE_CC + (selected_chain_index - 1), 1))
+                                self.send_midi(cc_message(
+                                    FX_UPPER_BUTTON_ROW_BASE_CC + (selected_chain_index - 1), 1))
                     elif cc_no == MX_DISPLAY_PAGE_UP:
-                        if selected_chain_index < len(rack_device.chains) - 1:
+                        if selected_chain_index < len(chains) - 1:
                             new_index = selected_chain_index + 1
                             if assigned_device_parent_type == 'Chain' and rack_device.class_name != 'MidiEffectGroupDevice':
-                                for chain in rack_device.chains:
+                                for chain in chains:
                                     chain.devices[0].parameters[0].value = chain.devices[0].parameters[0].min
                                     chain.solo = False
-                                rack_device.chains[new_index].devices[0].parameters[0].value = chain.devices[0].parameters[0].max
-                                rack_device.chains[new_index].solo = True
+                                chains[new_index].devices[0].parameters[0].value = chain.devices[0].parameters[0].max
+                                chains[new_index].solo = True
                             self.song().view.select_device(
-                                rack_device.chains[new_index].devices[0], True)
+                                chains[new_index].devices[0], True)
                             self.__reassign_strips()
                             self.__selected_track.set_data(
-                                assigned_device_index, new_index)
+                                chain_data_key, new_index)
                             if not self.__transport_locked:
-                                self.send_midi((self.cc_status_byte(
-                                ), FX_UPPER_BUTTON_ROW_BASE_CC + (selected_chain_index + 1), 1))
+                                self.send_midi(cc_message(
+                                    FX_UPPER_BUTTON_ROW_BASE_CC + (selected_chain_index + 1), 1))
                     else:
                         assert False, u'unknown Display midi message'
 
@@ -460,15 +438,18 @@ class EffectController(RemoteSLComponent):
             assert False, u'unknown Transport CC ' + str(cc_no)
 
     def __on_transport_lock_changed(self):
+        # The SL switches the meaning of its button LEDs when the transport lock
+        # changes, so the state we remember for them is no longer valid.
+        self.force_midi_resync()
         self.__reassign_strips()
 
     def __update_select_row_leds(self):
         if self.__assigned_device_is_locked:
             self.send_midi(
-                (self.cc_status_byte(), FX_SELECT_UPPER_BUTTON_ROW, CC_VAL_BUTTON_PRESSED))
+                cc_message(FX_SELECT_UPPER_BUTTON_ROW, CC_VAL_BUTTON_PRESSED))
         else:
             self.send_midi(
-                (self.cc_status_byte(), FX_SELECT_UPPER_BUTTON_ROW, CC_VAL_BUTTON_RELEASED))
+                cc_message(FX_SELECT_UPPER_BUTTON_ROW, CC_VAL_BUTTON_RELEASED))
 
     def lock_to_device(self, device):
         if device:
@@ -493,9 +474,9 @@ class EffectController(RemoteSLComponent):
     def __report_bank(self):
         if self.__show_bank:
             self.__show_bank = False
-            if self.__assigned_device.class_name in list(DEVICE_DICT.keys()):
-                if self.__assigned_device.class_name in list(BANK_NAME_DICT.keys()):
-                    bank_names = BANK_NAME_DICT[self.__assigned_device.class_name]
+            if self.__bank_index.has_best_of_banks():
+                bank_names = self.__bank_index.bank_names()
+                if bank_names is not None:
                     if bank_names and len(bank_names) > self.__bank:
                         bank_name = bank_names[self.__bank]
                         self.__show_bank_select(bank_name)
@@ -519,20 +500,26 @@ class EffectController(RemoteSLComponent):
             self.__bank = 0
             if not self.__assigned_device == None:
                 self.__assigned_device.remove_parameters_listener(
-                    self.__device_changed)
+                    self.__on_parameters_changed)
                 self.__assigned_device.remove_is_active_listener(
                     self.__device_changed)
             self.__show_bank = False
             self.__assigned_device = device
+            self.__bank_index = None
             if not self.__assigned_device == None:
+                self.__bank_index = DeviceBankIndex(self.__assigned_device)
                 self.__assigned_device.add_parameters_listener(
-                    self.__device_changed)
+                    self.__on_parameters_changed)
                 self.__assigned_device.add_is_active_listener(
                     self.__device_changed)
 
     def __device_changed(self):
         self.__reassign_strips()
 
+    def __on_parameters_changed(self):
+        self.__bank_index = DeviceBankIndex(self.__assigned_device)
+        self.__reassign_strips()
+
 
 class EffectChannelStrip(object):
     u"""Represents one of the 8 strips in the Effect controls that we use for parameter
@@ -551,49 +538,27 @@ class EffectChannelStrip(object):
         self.__assigned_parameter = parameter
 
     def on_upper_button_pressed(self):
-        selected_track = self.__effect_controller.remote_sl_selected_track()
-
         assigned_device = self.__effect_controller.remote_sl_assigned_device()
-        assigned_device_index = self.__effect_controller.remote_sl_assigned_device_index()
-
-        assigned_device_type = type(assigned_device).__name__
-        assigned_device_parent_type = type(
-            assigned_device.canonical_parent).__name__
 
         if self.__effect_controller.remote_sl_transport_locked():
-            assigned_device_chain_n = None
-
-            if FX_LOWER_BUTTON_ROW_DEVICE_CHILDS and (assigned_device_parent_type == 'Chain' or assigned_device_parent_type == 'DrumChain'):
-                rack_device = assigned_device.canonical_parent.canonical_parent
-                for n, chain in enumerate(rack_device.chains):
-                    if chain == assigned_device.canonical_parent:
-                        # Make a string, otherwise None = 0
-                        assigned_device_chain_n = str(n)
-
-            if assigned_device_chain_n:
-                snapshot_key = f'{str(assigned_device_index)}_{assigned_device_chain_n}_{str(self.__index)}'
-            else:
-                snapshot_key = f'{str(assigned_device_index)}_{str(self.__index)}'
-
-            snapshot_data = selected_track.get_data(snapshot_key, None)
-
-            if self.__index < self.__effect_controller.remote_sl_count():
+            device_key = self.__effect_controller.remote_sl_snapshot_device_key()
+            if device_key is None:
+                # the device is not on the selected track
+                return
+
+            snapshots = self.__effect_controller.remote_sl_snapshots()
+            count = snapshots.count(device_key)
+            if self.__index < count:
                 # LOAD
-                parameter_values = snapshot_data
+                parameter_values = snapshots.load(device_key, self.__index)
                 for parameter, parameter_value in zip(assigned_device.parameters, parameter_values):
                     parameter.value = parameter_value
                 self.__effect_controller.remote_sl_reassign_strips()
 
-            elif self.__index == self.__effect_controller.remote_sl_count():
-                if not snapshot_data:
-                    # SAVE
-                    selected_track.set_data(
-                        snapshot_key, [parameter.value for parameter in assigned_device.parameters])
-                else:
-                    # LOAD
-                    parameter_values = snapshot_data
-                    for parameter, parameter_value in zip(assigned_device.parameters, parameter_values):
-                        parameter.value = parameter_value
+            elif self.__index == count:
+                # SAVE
+                snapshots.save(
+                    device_key, self.__index, [parameter.value for parameter in assigned_device.parameters])
                 self.__effect_controller.remote_sl_reassign_strips()
         else:
             if self.__assigned_parameter and self.__assigned_parameter.is_enabled:
@@ -608,20 +573,23 @@ class EffectChannelStrip(object):
     def on_lower_button_pressed(self):
         selected_track = self.__effect_controller.remote_sl_selected_track()
         if selected_track:
-            if self.__index < len(selected_track.devices):
+            device_tree = self.__effect_controller.remote_sl_device_tree()
+            devices = device_tree.top_level_devices()
+            if self.__index < len(devices):
                 self.__effect_controller.remote_sl_parent().send_midi(
-                    (self.__effect_controller.cc_status_byte(), self.__index + FX_LOWER_BUTTON_ROW_BASE_CC, 1))
-                device = selected_track.devices[self.__index]
+                    cc_message(self.__index + FX_LOWER_BUTTON_ROW_BASE_CC, 1))
+                device = devices[self.__index]
                 assigned_device_type = type(device).__name__
                 if assigned_device_type == 'RackDevice' and FX_LOWER_BUTTON_ROW_DEVICE_CHILDS:
                     threshold = 1
                     if device.class_name == 'MidiEffectGroupDevice':
                         threshold = 0
-                    if device.chains and len(device.chains) > threshold:
-                        last_chain_key = str(self.__index)
+                    node = device_tree.node(device)
+                    chains = node.chains()
+                    if chains and len(chains) > threshold:
                         last_chain_n = selected_track.get_data(
-                            last_chain_key, 0)
-                        device = device.chains[last_chain_n].devices[0]
+                            node.chain_data_key(), 0)
+                        device = chains[last_chain_n].devices[0]
                     self.__effect_controller.remote_sl_parent().song().view.select_device(device, True)
                 else:
                     # self.__effect_controller.set_appointed_device(device)
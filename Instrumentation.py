@@ -0,0 +1,157 @@
+from __future__ import absolute_import, print_function, unicode_literals
+from builtins import range
+from builtins import object
+from datetime import datetime
+import os
+import time
+
+from .consts import *
+
+
+# Histogram buckets are powers of two: bucket n counts values < 2 ** n, which
+# covers 1 us to ~17 minutes for latencies, and any realistic message count.
+NUM_HISTOGRAM_BUCKETS = 31
+STATS_FILE_NAME = 'Stats.txt'
+
+
+class Histogram(object):
+    u"""Counts values in power-of-two buckets, and keeps the exact maximum.
+    Percentiles are reported as the upper bound of the bucket they fall into.
+    """
+
+    def __init__(self):
+        self.__buckets = [0 for x in range(NUM_HISTOGRAM_BUCKETS)]
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        bucket = min(int(value).bit_length(), NUM_HISTOGRAM_BUCKETS - 1)
+        self.__buckets[bucket] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction):
+        if not self.count:
+            return 0
+        rank = fraction * self.count
+        seen = 0
+        for bucket, bucket_count in enumerate(self.__buckets):
+            seen += bucket_count
+            if seen >= rank:
+                return min(2 ** bucket, self.max)
+        return self.max
+
+
+class Instrumentation(object):
+    u"""Collects call counts and latencies of the hot paths, and the number of
+    MIDI messages going in and out per timer tick.
+
+    Only active with INSTRUMENTATION set in consts. Otherwise 'timed' leaves the
+    functions untouched, and RemoteSL skips all counting, so that it costs
+    nothing in production.
+    """
+
+    def __init__(self):
+        self.__latencies = {}
+        self.__midi_in_per_tick = Histogram()
+        self.__midi_out_per_tick = Histogram()
+        self.__midi_in = 0
+        self.__midi_out = 0
+        self.__held_combo_presses = {}
+        self.__combo_completed = False
+        self.__started = datetime.now()
+
+    def timed(self, name):
+        histogram = self.__latencies.setdefault(name, Histogram())
+
+        def decorator(function):
+            def timed_function(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    histogram.add((time.perf_counter() - start) * 1000000.0)
+            timed_function.__name__ = function.__name__
+            timed_function.__doc__ = function.__doc__
+            return timed_function
+        return decorator
+
+    def counted_sender(self, send_midi):
+        u"""Wraps the function that finally sends MIDI to the controller.
+        """
+        def counted_send_midi(midi_event_bytes):
+            self.__midi_out += 1
+            send_midi(midi_event_bytes)
+        return counted_send_midi
+
+    def midi_received(self, midi_bytes):
+        u"""Counts an incoming message, and watches for the button combo that asks
+        for a stats dump (INSTRUMENTATION_DUMP_COMBO).
+
+        The buttons of the combo have functions of their own, so their presses are
+        held back: when the combo is completed, they (and their releases) are
+        dropped; a button released without completing it is pressed and released
+        then. Returns the messages to handle, and True if the combo was completed.
+        """
+        self.__midi_in += 1
+        if len(midi_bytes) != 3 or midi_bytes[0] & 240 != CC_STATUS or \
+                midi_bytes[1] not in INSTRUMENTATION_DUMP_COMBO:
+            return (midi_bytes,), False
+        cc_no = midi_bytes[1]
+        if midi_bytes[2] != CC_VAL_BUTTON_RELEASED:
+            self.__held_combo_presses[cc_no] = midi_bytes
+            if not self.__combo_completed and \
+                    len(self.__held_combo_presses) == len(INSTRUMENTATION_DUMP_COMBO):
+                self.__combo_completed = True
+                return (), True
+            return (), False
+        press = self.__held_combo_presses.pop(cc_no, None)
+        if self.__combo_completed:
+            if not self.__held_combo_presses:
+                self.__combo_completed = False
+            return (), False
+        if press is None:
+            return (midi_bytes,), False
+        return (press, midi_bytes), False
+
+    def end_tick(self):
+        self.__midi_in_per_tick.add(self.__midi_in)
+        self.__midi_out_per_tick.add(self.__midi_out)
+        self.__midi_in = 0
+        self.__midi_out = 0
+
+    def report(self):
+        lines = [u'RemoteSL stats since %s' % self.__started.strftime(u'%d/%m/%Y %H:%M:%S'),
+                 u'%-40s %8s %10s %10s %10s' % (u'callback', u'calls', u'p50 us', u'p99 us', u'max us')]
+        for name in sorted(self.__latencies):
+            histogram = self.__latencies[name]
+            lines.append(u'%-40s %8d %10d %10d %10d' % (name, histogram.count, histogram.percentile(0.5),
+                                                        histogram.percentile(0.99), histogram.max))
+        lines.append(u'%-40s %8s %10s %10s %10s' %
+                     (u'MIDI per tick', u'ticks', u'p50', u'p99', u'max'))
+        for name, histogram in ((u'in', self.__midi_in_per_tick), (u'out', self.__midi_out_per_tick)):
+            lines.append(u'%-40s %8d %10d %10d %10d' % (name, histogram.count, histogram.percentile(0.5),
+                                                        histogram.percentile(0.99), histogram.max))
+        return lines
+
+    def dump(self):
+        dir_name = os.path.dirname(os.path.abspath(__file__))
+        with open(os.path.join(dir_name, STATS_FILE_NAME), 'a') as file:
+            for line in self.report():
+                file.write(line + '\n')
+            file.write('\n')
+
+
+instrumentation = Instrumentation()
+
+
+def timed(name):
+    u"""Decorator that records call count and latency of a hot path under 'name'
+    when INSTRUMENTATION is on, and returns the function unchanged otherwise.
+    """
+    if INSTRUMENTATION:
+        return instrumentation.timed(name)
+    return lambda function: function
@@ -0,0 +1,136 @@
+from __future__ import absolute_import, print_function, unicode_literals
+from builtins import str
+from builtins import range
+from builtins import object
+from collections import deque
+from datetime import datetime
+import os
+import threading
+import time
+
+from .consts import *
+
+
+LOG_FILE_NAME = 'Log.txt'
+LOG_BUFFER_SIZE = 4096
+LOG_WRITE_INTERVAL = 0.5
+
+
+class Logger(object):
+    u"""Writes log lines to Log.txt next to the script, without doing any disk I/O
+    on Live's main thread.
+
+    Logging only appends the messages and a timestamp to an in-memory ring buffer
+    (the oldest lines are dropped if the writer can not keep up). A background
+    thread formats and writes them in batches, and rotates the file once it grows
+    over LOG_MAX_BYTES. Call flush or close to write everything synchronously.
+
+    All script instances write to the same file, so they share one Logger, see
+    acquire_logger.
+    """
+
+    def __init__(self, file_name=LOG_FILE_NAME, level=LOG_LEVEL):
+        dir_name = os.path.dirname(os.path.abspath(__file__))
+        self.__path = os.path.join(dir_name, file_name)
+        self.__level = level
+        self.__buffer = deque(maxlen=LOG_BUFFER_SIZE)
+        self.__lock = threading.Lock()
+        self.__wake_up = threading.Event()
+        self.__thread = None
+        self.__closed = False
+
+    def is_enabled_for(self, level):
+        return level >= self.__level and not self.__closed
+
+    def log(self, level, *messages):
+        if level >= self.__level and not self.__closed:
+            self.__buffer.append((time.time(), messages))
+            if self.__thread is None:
+                self.__start_writer()
+
+    def flush(self):
+        u"""Writes all buffered lines before returning.
+        """
+        self.__write_pending()
+
+    def close(self):
+        self.__closed = True
+        if self.__thread is not None:
+            self.__wake_up.set()
+            self.__thread.join(LOG_WRITE_INTERVAL * 2)
+            self.__thread = None
+        self.flush()
+
+    def __start_writer(self):
+        self.__thread = threading.Thread(
+            target=self.__run, name=u'RemoteSL Logger')
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def __run(self):
+        while not self.__closed:
+            self.__wake_up.wait(LOG_WRITE_INTERVAL)
+            self.__wake_up.clear()
+            try:
+                self.__write_pending()
+            except (IOError, OSError) as error:
+                # the lines are lost, but keep logging for the rest of the session
+                print(u'RemoteSL: could not write %s: %s' % (self.__path, error))
+
+    def __write_pending(self):
+        with self.__lock:
+            lines = []
+            while self.__buffer:
+                timestamp, messages = self.__buffer.popleft()
+                prefix = datetime.fromtimestamp(
+                    timestamp).strftime(u'%d/%m/%Y %H:%M')
+                for message in messages:
+                    if message:
+                        lines.append(u'%s %s\n' % (prefix, str(message)))
+                    else:
+                        lines.append(u'\n')
+            if lines:
+                self.__rotate_if_needed()
+                with open(self.__path, 'a') as file:
+                    file.write(u''.join(lines))
+
+    def __rotate_if_needed(self):
+        try:
+            if os.path.getsize(self.__path) < LOG_MAX_BYTES:
+                return
+        except OSError:
+            return
+        base, extension = os.path.splitext(self.__path)
+        for n in range(LOG_BACKUP_COUNT - 1, 0, -1):
+            older = u'%s.%d%s' % (base, n, extension)
+            if os.path.exists(older):
+                os.replace(older, u'%s.%d%s' % (base, n + 1, extension))
+        if LOG_BACKUP_COUNT > 0:
+            os.replace(self.__path, u'%s.1%s' % (base, extension))
+        else:
+            os.remove(self.__path)
+
+
+_shared_logger = None
+_shared_logger_users = 0
+
+
+def acquire_logger():
+    u"""Returns the Logger shared by all script instances. Every call must be
+    matched by a release_logger, the last one closes the Logger.
+    """
+    global _shared_logger, _shared_logger_users
+    if _shared_logger is None:
+        _shared_logger = Logger()
+    _shared_logger_users += 1
+    return _shared_logger
+
+
+def release_logger():
+    global _shared_logger, _shared_logger_users
+    _shared_logger_users -= 1
+    if _shared_logger_users == 0:
+        _shared_logger.close()
+        _shared_logger = None
+    else:
+        _shared_logger.flush()
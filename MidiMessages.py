@@ -0,0 +1,43 @@
+from __future__ import absolute_import, print_function, unicode_literals
+
+from .consts import *
+
+
+DISPLAY_TEXT_COMMAND = 4
+DISPLAY_CLEAR_COMMAND = (2, 2)
+LEFT_DISPLAY_ID = 4
+RIGHT_DISPLAY_ID = 5
+
+CLEAR_LEFT_DISPLAY_MESSAGE = SL_SYSEX_HEADER + \
+    DISPLAY_CLEAR_COMMAND + (LEFT_DISPLAY_ID,) + SYSEX_END
+CLEAR_RIGHT_DISPLAY_MESSAGE = SL_SYSEX_HEADER + \
+    DISPLAY_CLEAR_COMMAND + (RIGHT_DISPLAY_ID,) + SYSEX_END
+
+_CC_STATUS_BYTE = CC_STATUS + SL_MIDI_CHANNEL
+_cc_messages = {}
+_display_text_headers = {}
+
+
+def cc_message(cc_no, value):
+    u"""Returns the (cached) CC message on the SL channel, as used for all LEDs
+    and encoder rings.
+    """
+    key = cc_no << 7 | value
+    try:
+        return _cc_messages[key]
+    except KeyError:
+        message = _cc_messages[key] = (_CC_STATUS_BYTE, cc_no, value)
+        return message
+
+
+def display_text_message(text, row_id, offset=0):
+    u"""Returns the sysex that writes 'text' at 'offset' into display row 'row_id'.
+    Characters that are not ASCII are replaced.
+    """
+    key = offset << 3 | row_id
+    try:
+        header = _display_text_headers[key]
+    except KeyError:
+        header = _display_text_headers[key] = DISPLAY_TEXT_SYSEX_HEADER + \
+            (offset, row_id, DISPLAY_TEXT_COMMAND)
+    return header + tuple(text.encode(u'ascii', u'replace')) + SYSEX_END
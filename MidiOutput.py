@@ -0,0 +1,108 @@
+from __future__ import absolute_import, print_function, unicode_literals
+from builtins import object
+from collections import deque
+
+from .consts import *
+
+
+# CCs that do not describe a piece of hardware state (commands and enquiries),
+# or whose state is also written by Live itself (the encoder ring feedback), so
+# that the shadow copy can not be trusted for them.
+UNSHADOWED_CCS = frozenset([ALL_LEDS_OFF_MESSAGE[1], LOCK_ENQUIRY_MESSAGE[1]] +
+                           fx_encoder_feedback_ccs)
+
+DISPLAY_TEXT_HEADER_LENGTH = len(DISPLAY_TEXT_SYSEX_HEADER)
+DISPLAY_TEXT_ROW_POS = DISPLAY_TEXT_HEADER_LENGTH + 1
+# header + (offset, row_id) + text command + a complete row + sysex end
+FULL_ROW_DISPLAY_TEXT_LENGTH = DISPLAY_TEXT_HEADER_LENGTH + \
+    3 + NUM_CHARS_PER_DISPLAY_LINE + 1
+
+
+class MidiOutput(object):
+    u"""The output layer behind RemoteSL.send_midi.
+
+    Keeps a shadow copy of the last value sent for every (status, cc) pair, and
+    drops short messages that would not change the state of the hardware.
+
+    Messages are not sent right away, but collected until the end of the current
+    callback from Live (see flush) or the next timer tick (see tick). LEDs, encoder
+    rings and non-display sysex then go out first, in the order they were sent.
+    Display text sysex follows, paced to DISPLAY_SYSEX_BYTES_PER_TICK, so that a
+    display rewrite never delays the LED feedback of the controls. Other sysex
+    sent while display text is pending (like clearing the displays) is queued
+    behind that text, so the sysex still reaches the SL in the order it was sent.
+    """
+
+    def __init__(self, send_midi):
+        self.__send_midi = send_midi
+        self.__shadow = {}
+        self.__pending = []
+        self.__pending_display = deque()
+        self.__display_budget = DISPLAY_SYSEX_BYTES_PER_TICK
+
+    def send(self, midi_event_bytes):
+        if len(midi_event_bytes) == 3 and midi_event_bytes[0] != 240:
+            if midi_event_bytes[1] in UNSHADOWED_CCS:
+                if midi_event_bytes == ALL_LEDS_OFF_MESSAGE:
+                    self.invalidate()
+            else:
+                key = (midi_event_bytes[0], midi_event_bytes[1])
+                if self.__shadow.get(key) == midi_event_bytes[2]:
+                    return
+                self.__shadow[key] = midi_event_bytes[2]
+            self.__pending.append(midi_event_bytes)
+        elif self.__is_display_text(midi_event_bytes):
+            self.__queue_display_text(midi_event_bytes)
+        elif self.__pending_display:
+            self.__pending_display.append(midi_event_bytes)
+        else:
+            self.__pending.append(midi_event_bytes)
+
+    def invalidate(self):
+        u"""Forgets the shadowed hardware state, so that the next message for every
+        (status, cc) pair is sent out again (force full resync).
+        """
+        self.__shadow.clear()
+
+    def tick(self):
+        u"""Called once per timer tick: renews the display budget and flushes.
+        """
+        self.__display_budget = DISPLAY_SYSEX_BYTES_PER_TICK
+        self.flush()
+
+    def flush(self):
+        u"""Sends all pending short messages, then as much of the pending display
+        text as the budget of the current tick allows.
+        """
+        if self.__pending:
+            pending = self.__pending
+            self.__pending = []
+            for midi_event_bytes in pending:
+                self.__send_midi(midi_event_bytes)
+
+        while self.__pending_display:
+            size = len(self.__pending_display[0])
+            if size > self.__display_budget and self.__display_budget < DISPLAY_SYSEX_BYTES_PER_TICK:
+                break
+            self.__display_budget -= size
+            self.__send_midi(self.__pending_display.popleft())
+
+    def flush_all(self):
+        u"""Sends everything that is pending, ignoring the display budget.
+        """
+        self.flush()
+        while self.__pending_display:
+            self.__send_midi(self.__pending_display.popleft())
+
+    def __is_display_text(self, midi_event_bytes):
+        return len(midi_event_bytes) > DISPLAY_TEXT_ROW_POS and \
+            tuple(midi_event_bytes[:DISPLAY_TEXT_HEADER_LENGTH]) == DISPLAY_TEXT_SYSEX_HEADER
+
+    def __queue_display_text(self, midi_event_bytes):
+        if len(midi_event_bytes) == FULL_ROW_DISPLAY_TEXT_LENGTH:
+            # A complete row supersedes everything still pending for that row
+            row_id = midi_event_bytes[DISPLAY_TEXT_ROW_POS]
+            self.__pending_display = deque(
+                m for m in self.__pending_display
+                if not self.__is_display_text(m) or m[DISPLAY_TEXT_ROW_POS] != row_id)
+        self.__pending_display.append(midi_event_bytes)
@@ -0,0 +1,88 @@
+from __future__ import absolute_import, print_function, unicode_literals
+from builtins import range
+from builtins import object
+
+from .consts import *
+
+
+NUM_STATUS_NIBBLES = 16
+TABLE_SIZE = NUM_CC_NO + 1
+
+
+def on_value(value, callback):
+    u"""Returns a handler that calls 'callback' without arguments, but only when
+    the received value equals 'value' (e.g. only on button press).
+    """
+    def handler(midi_value):
+        if midi_value == value:
+            callback()
+    return handler
+
+
+def unexpected(message):
+    u"""Returns a handler for MIDI that should never reach the script (it is either
+    passed to Live, or not forwarded at all).
+    """
+    def handler(midi_value):
+        assert False, message
+    return handler
+
+
+def fill_handler_table(table, numbers, handler_factory):
+    u"""Sets table[n] = handler_factory(n) for all 'numbers' that have no handler
+    yet, so earlier registrations take precedence over later ones.
+    """
+    for number in numbers:
+        if table[number] is None:
+            table[number] = handler_factory(number)
+
+
+def create_handler_table(rows):
+    u"""Compiles a list of (numbers, handler_factory) rows, given in order of
+    precedence, into a flat table indexed by CC or note number.
+    """
+    table = [None for x in range(TABLE_SIZE)]
+    for numbers, handler_factory in rows:
+        fill_handler_table(table, numbers, handler_factory)
+    return table
+
+
+class MidiRouter(object):
+    u"""Dispatches incoming short MIDI messages through flat lookup tables.
+
+    There is one 128 entry table per status nibble (Note On and Note Off share
+    one), indexed by the CC or note number. Every entry is a callable taking the
+    message value, usually already bound to the strip or button it belongs to,
+    so that routing a message costs two list lookups instead of chains of
+    membership tests.
+    """
+
+    def __init__(self, unknown_message_handler):
+        self.__unknown_message_handler = unknown_message_handler
+        self.__tables = [None for x in range(NUM_STATUS_NIBBLES)]
+        note_table = [None for x in range(TABLE_SIZE)]
+        self.__tables[NOTE_ON_STATUS >> 4] = note_table
+        self.__tables[NOTE_OFF_STATUS >> 4] = note_table
+        self.__tables[CC_STATUS >> 4] = [None for x in range(TABLE_SIZE)]
+
+    def add_cc_handlers(self, cc_numbers, handler_factory):
+        u"""Routes all 'cc_numbers' to handler_factory(cc_no). CCs that already
+        have a handler keep it, so register in order of precedence.
+        """
+        fill_handler_table(
+            self.__tables[CC_STATUS >> 4], cc_numbers, handler_factory)
+
+    def add_note_handlers(self, notes, handler_factory):
+        u"""Same as add_cc_handlers, for Note On and Note Off messages.
+        """
+        fill_handler_table(
+            self.__tables[NOTE_ON_STATUS >> 4], notes, handler_factory)
+
+    def route(self, midi_bytes):
+        table = self.__tables[midi_bytes[0] >> 4]
+        if table is not None:
+            handler = table[midi_bytes[1]]
+            if handler is not None:
+                handler(midi_bytes[2])
+                return
+        self.__unknown_message_handler(midi_bytes)
@@ -2,10 +2,18 @@ from __future__ import absolute_import, print_function, unicode_literals
 from builtins import str
 from builtins import range
 from builtins import object
+from functools import partial
 
 import Live
 
 from .RemoteSLComponent import RemoteSLComponent
+from .MidiMessages import cc_message
+from .Instrumentation import timed
+from .SurfaceLink import SurfaceLink
+from .ArmedTracks import ArmedTracks
+from .Scrubber import Scrubber, SCRUB_FORWARD, SCRUB_REWIND
+from .MixerMeters import MixerMeters
+from .MidiRouter import TABLE_SIZE, create_handler_table, on_value, unexpected
 from .consts import *
 
 
@@ -21,22 +29,32 @@ class MixerController(RemoteSLComponent):
     All controls will be handled by this script: The sliders are mapped to volume/pan/sends
     of the underlying tracks, so that 8 tracks can be controlled at once.
     Banks can be switched via the up/down bottons next to the right display.
+    The mixers of several linked RemoteSLs act as one wider mixer, see SurfaceLink.
     """
 
     def __init__(self, remote_sl_parent, display_controller):
         RemoteSLComponent.__init__(self, remote_sl_parent)
         self.__display_controller = display_controller
         self.__parent = remote_sl_parent
-        self.__forward_button_down = False
-        self.__rewind_button_down = False
-        self.__strip_offset = 0
+        self.__scrubber = Scrubber(self.song())
         self.__slider_mode = SLIDER_MODE_VOLUME
         self.__strips = [MixerChannelStrip(self, i)
                          for i in range(NUM_CONTROLS_PER_ROW)]
+        self.__cc_handlers = self.__create_cc_handlers()
         self.__assigned_tracks = []
+        self.__track_names = []
+        self.__slider_parameter_tables = {}
         self.__transport_locked = False
         self.__lock_enquiry_delay = 0
-        self.song().add_visible_tracks_listener(self.__on_tracks_added_or_deleted)
+        self.__lit_select_strip = None
+        self.__meters = None
+        if MX_METERS:
+            self.__meters = MixerMeters(self.send_midi)
+        self.__surface = None
+        self.__link_to_surface(SurfaceLink(self.song()))
+        self.__armed_tracks = None
+        if MX_LOWER_BUTTON_TYPE == 'ARM':
+            self.__armed_tracks = ArmedTracks(self.song(), self.__on_track_arm_changed)
         self.song().add_record_mode_listener(self.__on_record_mode_changed)
         self.song().add_is_playing_listener(self.__on_is_playing_changed)
         self.song().add_loop_listener(self.__on_loop_changed)
@@ -44,54 +62,107 @@ class MixerController(RemoteSLComponent):
         if MX_LOWER_BUTTON_TYPE == 'SELECT':
             self.song().view.add_selected_track_listener(self.__on_track_selected_changed)
 
-        self.__reassign_strips()
+        self.__reassign_strips(force=True)
 
     def disconnect(self):
-        self.song().remove_visible_tracks_listener(self.__on_tracks_added_or_deleted)
+        self.__unlink_from_surface()
         self.song().remove_record_mode_listener(self.__on_record_mode_changed)
         self.song().remove_is_playing_listener(self.__on_is_playing_changed)
         self.song().remove_loop_listener(self.__on_loop_changed)
+        if MX_LOWER_BUTTON_TYPE == 'SELECT':
+            self.song().view.remove_selected_track_listener(self.__on_track_selected_changed)
         for strip in self.__strips:
             strip.set_assigned_track(None)
 
-        for track in self.__assigned_tracks:
-            if track and track.name_has_listener(self.__on_track_name_changed):
-                track.remove_name_listener(self.__on_track_name_changed)
+        if self.__armed_tracks:
+            self.__armed_tracks.disconnect()
 
     def remote_sl_parent(self):
         return self.__parent
 
+    def track_list(self):
+        return self.__surface.track_list()
+
+    def set_surface(self, surface):
+        u"""Makes this mixer a unit of 'surface' (and shows its tracks).
+        """
+        if surface != self.__surface:
+            self.__unlink_from_surface()
+            self.__link_to_surface(surface)
+            self.__reassign_strips()
+
+    def surface_changed(self):
+        self.__reassign_strips()
+
+    def __link_to_surface(self, surface):
+        self.__surface = surface
+        self.__surface.add_unit(self)
+        self.__surface.track_list().add_listener(self.__on_tracks_added_or_deleted)
+
+    def __unlink_from_surface(self):
+        surface = self.__surface
+        surface.track_list().remove_listener(self.__on_tracks_added_or_deleted)
+        surface.remove_unit(self)
+        if surface.has_units():
+            surface.validate_strip_offset()
+            surface.notify_units()
+        else:
+            surface.disconnect()
+
+    def is_track_armed(self, track):
+        return self.__armed_tracks.is_armed(track)
+
+    def strip_name_changed(self, index, name):
+        self.__track_names[index] = name
+        self.__display_controller.set_right_display_name(index, name)
+
     def slider_mode(self):
         return self.__slider_mode
 
+    def slider_parameters(self):
+        u"""The parameter of every slider in the current slider mode (None for
+        sliders without one). Each mode's table is only computed once per bank.
+        """
+        try:
+            return self.__slider_parameter_tables[self.__slider_mode]
+        except KeyError:
+            parameters = tuple([s.parameter_for_slider_mode(self.__slider_mode)
+                                for s in self.__strips])
+            self.__slider_parameter_tables[self.__slider_mode] = parameters
+            return parameters
+
     def receive_midi_cc(self, cc_no, cc_value):
-        if cc_no in mx_display_button_ccs:
-            self.__handle_page_up_down_ccs(cc_no, cc_value)
-        elif cc_no in mx_select_button_ccs:
-            self.__handle_select_button_ccs(cc_no, cc_value)
-        elif cc_no in mx_upper_button_row_ccs:
-            channel_strip = self.__strips[cc_no - MX_UPPER_BUTTON_ROW_BASE_CC]
-            if cc_value == CC_VAL_BUTTON_PRESSED:
-                channel_strip.upper_button_pressed()
-        elif cc_no in mx_lower_button_row_ccs:
-            channel_strip = self.__strips[cc_no - MX_LOWER_BUTTON_ROW_BASE_CC]
-            if cc_value == CC_VAL_BUTTON_PRESSED:
-                channel_strip.lower_button_pressed()
-        elif cc_no in mx_slider_row_ccs:
-            channel_strip = self.__strips[cc_no - MX_SLIDER_ROW_BASE_CC]
-            channel_strip.slider_moved(cc_value)
-        elif cc_no in ts_ccs:
-            self.__handle_transport_ccs(cc_no, cc_value)
-        else:
-            assert False, u'unknown FX midi message'
+        self.__cc_handlers[cc_no](cc_value)
+
+    def cc_handler(self, cc_no):
+        return self.__cc_handlers[cc_no]
+
+    def __create_cc_handlers(self):
+        u"""Resolves every CC once to the function that handles it, in the same
+        order of precedence as the rows are defined in consts.
+        """
+        return create_handler_table([
+            (mx_display_button_ccs, lambda cc_no: partial(
+                self.__handle_page_up_down_ccs, cc_no)),
+            (mx_select_button_ccs, lambda cc_no: partial(
+                self.__handle_select_button_ccs, cc_no)),
+            (mx_upper_button_row_ccs, lambda cc_no: on_value(
+                CC_VAL_BUTTON_PRESSED, self.__strips[cc_no - MX_UPPER_BUTTON_ROW_BASE_CC].upper_button_pressed)),
+            (mx_lower_button_row_ccs, lambda cc_no: on_value(
+                CC_VAL_BUTTON_PRESSED, self.__strips[cc_no - MX_LOWER_BUTTON_ROW_BASE_CC].lower_button_pressed)),
+            (mx_slider_row_ccs, lambda cc_no:
+                self.__strips[cc_no - MX_SLIDER_ROW_BASE_CC].slider_moved),
+            (ts_ccs, lambda cc_no: partial(
+                self.__handle_transport_ccs, cc_no)),
+            (range(TABLE_SIZE), lambda cc_no: unexpected(
+                u'unknown FX midi message'))])
 
     def build_midi_map(self, script_handle, midi_map_handle):
         needs_takeover = True
-        for s in self.__strips:
-            cc_no = MX_SLIDER_ROW_BASE_CC + self.__strips.index(s)
-            if s.assigned_track() and s.slider_parameter():
+        for index, parameter in enumerate(self.slider_parameters()):
+            cc_no = MX_SLIDER_ROW_BASE_CC + index
+            if parameter:
                 map_mode = Live.MidiMap.MapMode.absolute
-                parameter = s.slider_parameter()
                 Live.MidiMap.map_midi_cc(
                     midi_map_handle, parameter, SL_MIDI_CHANNEL, cc_no, map_mode, not needs_takeover)
             else:
@@ -106,76 +177,86 @@ class MixerController(RemoteSLComponent):
             Live.MidiMap.forward_midi_note(
                 script_handle, midi_map_handle, SL_MIDI_CHANNEL, note)
 
+    def midi_map_signature(self):
+        return self.slider_parameters()
+
     def refresh_state(self):
         self.__update_selected_row_leds()
-        self.__reassign_strips()
+        if self.__meters:
+            self.__meters.invalidate()
+        self.__reassign_strips(force=True)
         self.__lock_enquiry_delay = 3
 
     def update_display(self):
         if self.__lock_enquiry_delay > 0:
             self.__lock_enquiry_delay -= 1
             if self.__lock_enquiry_delay == 0:
-                self.send_midi((176, 103, 1))
-        if self.__rewind_button_down:
-            self.song().jump_by(-FORW_REW_JUMP_BY_AMOUNT)
-        if self.__forward_button_down:
-            self.song().jump_by(FORW_REW_JUMP_BY_AMOUNT)
-
-    def __reassign_strips(self):
-        track_index = self.__strip_offset
+                self.send_midi(LOCK_ENQUIRY_MESSAGE)
+        self.__scrubber.update()
+        if self.__meters and self.support_mkII():
+            self.__meters.update()
+
+    @timed(u'MixerController.reassign_strips')
+    def __reassign_strips(self, force=False):
+        u"""Assigns the tracks of the current bank to the strips.
+
+        Only strips whose track changed swap their listeners and resend their
+        LEDs (all strips do with 'force').
+        """
+        track_index = self.__surface.unit_offset(self)
         track_names = []
-        parameters = []
-        for track in self.__assigned_tracks:
-            if track and track.name_has_listener(self.__on_track_name_changed):
-                track.remove_name_listener(self.__on_track_name_changed)
-
         self.__assigned_tracks = []
-        all_tracks = tuple(self.song().visible_tracks) + \
-            tuple(self.song().return_tracks) + (self.song().master_track,)
+        self.__slider_parameter_tables = {}
+        all_tracks = self.track_list().tracks()
         for s in self.__strips:
+            track = None
             if track_index < len(all_tracks):
                 track = all_tracks[track_index]
+            if s.assigned_track() != track:
                 s.set_assigned_track(track)
+            elif force:
+                s.refresh_leds()
+            if track:
                 track_names.append(track.name)
-                parameters.append(s.slider_parameter())
-                track.add_name_listener(self.__on_track_name_changed)
                 self.__assigned_tracks.append(track)
             else:
-                s.set_assigned_track(None)
                 track_names.append(u'')
-                parameters.append(None)
             track_index += 1
 
-        self.__display_controller.setup_right_display(track_names, parameters)
-        self.request_rebuild_midi_map()
+        self.__track_names = track_names
+        self.__show_slider_parameters()
+        if self.__meters:
+            self.__meters.set_tracks([s.assigned_track() for s in self.__strips])
+        if MX_LOWER_BUTTON_TYPE == 'SELECT':
+            self.__update_select_leds(force)
         if self.support_mkII():
             page_up_value = CC_VAL_BUTTON_RELEASED
             page_down_value = CC_VAL_BUTTON_RELEASED
-            if len(all_tracks) > NUM_CONTROLS_PER_ROW and self.__strip_offset < len(all_tracks) - NUM_CONTROLS_PER_ROW:
+            num_strips = self.__surface.num_strips()
+            strip_offset = self.__surface.strip_offset()
+            if len(all_tracks) > num_strips and strip_offset < len(all_tracks) - num_strips:
                 page_up_value = CC_VAL_BUTTON_PRESSED
-            if self.__strip_offset > 0:
+            if strip_offset > 0:
                 page_down_value = CC_VAL_BUTTON_PRESSED
             if not MX_DISPLAY_PAGE_DEVICE_CHILDS:
                 self.send_midi(
-                    (self.cc_status_byte(), MX_DISPLAY_PAGE_UP, page_up_value))
+                    cc_message(MX_DISPLAY_PAGE_UP, page_up_value))
                 self.send_midi(
-                    (self.cc_status_byte(), MX_DISPLAY_PAGE_DOWN, page_down_value))
+                    cc_message(MX_DISPLAY_PAGE_DOWN, page_down_value))
 
     def __handle_page_up_down_ccs(self, cc_no, cc_value):
-        all_tracks = tuple(self.song().visible_tracks) + \
-            tuple(self.song().return_tracks) + (self.song().master_track,)
+        all_tracks = self.track_list().tracks()
+        surface = self.__surface
+        num_strips = surface.num_strips()
+        strip_offset = surface.strip_offset()
         if cc_no == MX_DISPLAY_PAGE_UP:
             if cc_value == CC_VAL_BUTTON_PRESSED:
-                if len(all_tracks) > NUM_CONTROLS_PER_ROW and self.__strip_offset < len(all_tracks) - NUM_CONTROLS_PER_ROW:
-                    self.__strip_offset += NUM_CONTROLS_PER_ROW
-                    self.__validate_strip_offset()
-                    self.__reassign_strips()
+                if len(all_tracks) > num_strips and strip_offset < len(all_tracks) - num_strips:
+                    surface.set_strip_offset(min(strip_offset + num_strips, len(all_tracks) - 1))
         elif cc_no == MX_DISPLAY_PAGE_DOWN:
             if cc_value == CC_VAL_BUTTON_PRESSED:
-                if len(all_tracks) > NUM_CONTROLS_PER_ROW and self.__strip_offset > 0:
-                    self.__strip_offset -= NUM_CONTROLS_PER_ROW
-                    self.__validate_strip_offset()
-                    self.__reassign_strips()
+                if len(all_tracks) > num_strips and strip_offset > 0:
+                    surface.set_strip_offset(max(0, strip_offset - num_strips))
         else:
             assert False, u'unknown Display midi message'
 
@@ -195,16 +276,16 @@ class MixerController(RemoteSLComponent):
     def __handle_transport_ccs(self, cc_no, cc_value):
         if cc_no == TS_REWIND_CC:
             if cc_value == CC_VAL_BUTTON_PRESSED:
-                self.__rewind_button_down = True
                 self.song().jump_by(-FORW_REW_JUMP_BY_AMOUNT)
+                self.__scrubber.start(SCRUB_REWIND)
             else:
-                self.__rewind_button_down = False
+                self.__scrubber.stop(SCRUB_REWIND)
         elif cc_no == TS_FORWARD_CC:
             if cc_value == CC_VAL_BUTTON_PRESSED:
-                self.__forward_button_down = True
                 self.song().jump_by(FORW_REW_JUMP_BY_AMOUNT)
+                self.__scrubber.start(SCRUB_FORWARD)
             else:
-                self.__forward_button_down = False
+                self.__scrubber.stop(SCRUB_FORWARD)
         elif cc_no == TS_STOP_CC:
             if cc_value == CC_VAL_BUTTON_PRESSED:
                 self.song().stop_playing()
@@ -224,28 +305,33 @@ class MixerController(RemoteSLComponent):
             assert False, u'unknown Transport CC ' + str(cc_no)
 
     def __on_transport_lock_changed(self):
+        # The SL switches the meaning of its button LEDs when the transport lock
+        # changes, so the state we remember for them is no longer valid.
+        self.force_midi_resync()
         for strip in self.__strips:
             strip.take_control_of_lower_button(not self.__transport_locked)
+        # all lower button LEDs were just turned off
+        self.__lit_select_strip = None
+        if self.__meters:
+            self.__meters.set_enabled(not self.__transport_locked)
 
         if self.__transport_locked:
             self.__on_is_playing_changed()
             self.__on_loop_changed()
             self.__on_record_mode_changed()
+        elif MX_LOWER_BUTTON_TYPE == 'SELECT':
+            self.__update_select_leds()
+
+    def __on_track_arm_changed(self, track):
+        strip_index = self.__strip_index_of(track)
+        if strip_index is not None:
+            self.__strips[strip_index]._on_arm_changed()
 
     def __on_tracks_added_or_deleted(self):
-        self.__validate_strip_offset()
+        self.__surface.validate_strip_offset()
         self.__validate_slider_mode()
         self.__reassign_strips()
 
-    def __on_track_name_changed(self):
-        self.__reassign_strips()
-
-    def __validate_strip_offset(self):
-        all_tracks = tuple(self.song().visible_tracks) + \
-            tuple(self.song().return_tracks) + (self.song().master_track,)
-        self.__strip_offset = min(self.__strip_offset, len(all_tracks) - 1)
-        self.__strip_offset = max(0, self.__strip_offset)
-
     def __validate_slider_mode(self):
         if self.__slider_mode - SLIDER_MODE_SEND >= len(self.song().return_tracks):
             self.__slider_mode = SLIDER_MODE_VOLUME
@@ -257,34 +343,39 @@ class MixerController(RemoteSLComponent):
             else:
                 self.__slider_mode = SLIDER_MODE_SEND
             self.__update_selected_row_leds()
-            self.__reassign_strips()
+            self.__show_slider_parameters()
         elif self.__slider_mode != new_mode:
             self.__slider_mode = new_mode
             self.__update_selected_row_leds()
-            self.__reassign_strips()
+            self.__show_slider_parameters()
+
+    def __show_slider_parameters(self):
+        self.__display_controller.setup_right_display(
+            self.__track_names, self.slider_parameters())
+        self.request_rebuild_midi_map()
 
     def __update_selected_row_leds(self):
         if self.__slider_mode == SLIDER_MODE_VOLUME:
             self.send_midi(
-                (self.cc_status_byte(), MX_SELECT_SLIDER_ROW, CC_VAL_BUTTON_PRESSED))
+                cc_message(MX_SELECT_SLIDER_ROW, CC_VAL_BUTTON_PRESSED))
             self.send_midi(
-                (self.cc_status_byte(), MX_SELECT_UPPER_BUTTON_ROW, CC_VAL_BUTTON_RELEASED))
+                cc_message(MX_SELECT_UPPER_BUTTON_ROW, CC_VAL_BUTTON_RELEASED))
             self.send_midi(
-                (self.cc_status_byte(), MX_SELECT_LOWER_BUTTON_ROW, CC_VAL_BUTTON_RELEASED))
+                cc_message(MX_SELECT_LOWER_BUTTON_ROW, CC_VAL_BUTTON_RELEASED))
         elif self.__slider_mode == SLIDER_MODE_PAN:
             self.send_midi(
-                (self.cc_status_byte(), MX_SELECT_SLIDER_ROW, CC_VAL_BUTTON_RELEASED))
+                cc_message(MX_SELECT_SLIDER_ROW, CC_VAL_BUTTON_RELEASED))
             self.send_midi(
-                (self.cc_status_byte(), MX_SELECT_UPPER_BUTTON_ROW, CC_VAL_BUTTON_PRESSED))
+                cc_message(MX_SELECT_UPPER_BUTTON_ROW, CC_VAL_BUTTON_PRESSED))
             self.send_midi(
-                (self.cc_status_byte(), MX_SELECT_LOWER_BUTTON_ROW, CC_VAL_BUTTON_RELEASED))
+                cc_message(MX_SELECT_LOWER_BUTTON_ROW, CC_VAL_BUTTON_RELEASED))
         elif self.__slider_mode >= SLIDER_MODE_SEND:
             self.send_midi(
-                (self.cc_status_byte(), MX_SELECT_SLIDER_ROW, CC_VAL_BUTTON_RELEASED))
+                cc_message(MX_SELECT_SLIDER_ROW, CC_VAL_BUTTON_RELEASED))
             self.send_midi(
-                (self.cc_status_byte(), MX_SELECT_UPPER_BUTTON_ROW, CC_VAL_BUTTON_RELEASED))
+                cc_message(MX_SELECT_UPPER_BUTTON_ROW, CC_VAL_BUTTON_RELEASED))
             self.send_midi(
-                (self.cc_status_byte(), MX_SELECT_LOWER_BUTTON_ROW, CC_VAL_BUTTON_PRESSED))
+                cc_message(MX_SELECT_LOWER_BUTTON_ROW, CC_VAL_BUTTON_PRESSED))
 
     def __on_record_mode_changed(self):
         if self.__transport_locked or not self.support_mkII():
@@ -294,39 +385,60 @@ class MixerController(RemoteSLComponent):
             record_value = CC_VAL_BUTTON_PRESSED
             if not self.song().record_mode:
                 record_value = CC_VAL_BUTTON_RELEASED
-            self.send_midi((self.cc_status_byte(), record_cc, record_value))
+            self.send_midi(cc_message(record_cc, record_value))
 
     def __on_is_playing_changed(self):
         if self.__transport_locked and self.support_mkII():
             if self.song().is_playing:
                 self.send_midi(
-                    (self.cc_status_byte(), 51, CC_VAL_BUTTON_PRESSED))
+                    cc_message(51, CC_VAL_BUTTON_PRESSED))
                 self.send_midi(
-                    (self.cc_status_byte(), 50, CC_VAL_BUTTON_RELEASED))
+                    cc_message(50, CC_VAL_BUTTON_RELEASED))
             else:
                 self.send_midi(
-                    (self.cc_status_byte(), 51, CC_VAL_BUTTON_RELEASED))
+                    cc_message(51, CC_VAL_BUTTON_RELEASED))
                 self.send_midi(
-                    (self.cc_status_byte(), 50, CC_VAL_BUTTON_PRESSED))
+                    cc_message(50, CC_VAL_BUTTON_PRESSED))
 
     def __on_loop_changed(self):
         if self.__transport_locked and self.support_mkII():
             if self.song().loop:
                 self.send_midi(
-                    (self.cc_status_byte(), 52, CC_VAL_BUTTON_PRESSED))
+                    cc_message(52, CC_VAL_BUTTON_PRESSED))
             else:
                 self.send_midi(
-                    (self.cc_status_byte(), 52, CC_VAL_BUTTON_RELEASED))
+                    cc_message(52, CC_VAL_BUTTON_RELEASED))
 
     def __on_track_selected_changed(self):
-        if not self.__transport_locked and self.support_mkII() and self.__slider_mode == SLIDER_MODE_VOLUME:
-            for n, track in enumerate(self.__assigned_tracks):
-                if track == self.song().view.selected_track:
+        self.__update_select_leds()
+
+    def __update_select_leds(self, force=False):
+        u"""Lights the lower button of the strip showing the selected track. Only
+        the LEDs of the previously and the newly lit strip are sent, unless
+        'force' is given.
+        """
+        if not MX_METERS and not self.__transport_locked and self.support_mkII() and self.__slider_mode == SLIDER_MODE_VOLUME:
+            strip_index = self.__strip_index_of(self.song().view.selected_track)
+            if force:
+                for n in range(NUM_CONTROLS_PER_ROW):
                     self.send_midi(
-                        (self.cc_status_byte(), n + MX_LOWER_BUTTON_ROW_BASE_CC, 1))
-                else:
+                        cc_message(n + MX_LOWER_BUTTON_ROW_BASE_CC, int(n == strip_index)))
+                self.__lit_select_strip = strip_index
+            elif strip_index != self.__lit_select_strip:
+                if self.__lit_select_strip is not None:
+                    self.send_midi(
+                        cc_message(self.__lit_select_strip + MX_LOWER_BUTTON_ROW_BASE_CC, 0))
+                if strip_index is not None:
                     self.send_midi(
-                        (self.cc_status_byte(), n + MX_LOWER_BUTTON_ROW_BASE_CC, 0))
+                        cc_message(strip_index + MX_LOWER_BUTTON_ROW_BASE_CC, 1))
+                self.__lit_select_strip = strip_index
+
+    def __strip_index_of(self, track):
+        track_index = self.track_list().index_of(track)
+        strip_offset = self.__surface.unit_offset(self)
+        if track_index is not None and 0 <= track_index - strip_offset < len(self.__assigned_tracks):
+            return track_index - strip_offset
+        return None
 
     def is_arm_exclusive(self):
         return self.__parent.song().exclusive_arm
@@ -337,8 +449,8 @@ class MixerController(RemoteSLComponent):
 
     def track_about_to_arm(self, track):
         if track and self.__parent.song().exclusive_arm:
-            for t in self.__parent.song().tracks:
-                if t.can_be_armed and t.arm and not t == track:
+            for t in self.__armed_tracks.armed_tracks():
+                if not t == track:
                     t.arm = False
 
 
@@ -361,26 +473,27 @@ class MixerChannelStrip(object):
 
     def set_assigned_track(self, track):
         if self.__assigned_track != None:
-            if self.__assigned_track != self.song().master_track:
+            if not self.__mixer_controller.track_list().is_master_track(self.__assigned_track):
                 if MX_UPPER_BUTTON_TYPE == 'MUTE':
                     self.__assigned_track.remove_mute_listener(
                         self._on_mute_changed)
                 elif MX_UPPER_BUTTON_TYPE == 'SOLO':
                     self.__assigned_track.remove_solo_listener(
                         self._on_solo_changed)
-            if MX_LOWER_BUTTON_TYPE == 'ARM' and self.__assigned_track.can_be_armed:
-                self.__assigned_track.remove_arm_listener(self._on_arm_changed)
+            self.__assigned_track.remove_name_listener(self._on_name_changed)
         self.__assigned_track = track
         if self.__assigned_track != None:
-            if self.__assigned_track != self.song().master_track:
+            if not self.__mixer_controller.track_list().is_master_track(self.__assigned_track):
                 if MX_UPPER_BUTTON_TYPE == 'MUTE':
                     self.__assigned_track.add_mute_listener(
                         self._on_mute_changed)
                 elif MX_UPPER_BUTTON_TYPE == 'SOLO':
                     self.__assigned_track.add_solo_listener(
                         self._on_solo_changed)
-            if MX_LOWER_BUTTON_TYPE == 'ARM' and self.__assigned_track.can_be_armed:
-                self.__assigned_track.add_arm_listener(self._on_arm_changed)
+            self.__assigned_track.add_name_listener(self._on_name_changed)
+        self.refresh_leds()
+
+    def refresh_leds(self):
         if MX_UPPER_BUTTON_TYPE == 'MUTE':
             self._on_mute_changed()
         elif MX_UPPER_BUTTON_TYPE == 'SOLO':
@@ -389,7 +502,9 @@ class MixerChannelStrip(object):
             self._on_arm_changed()
 
     def slider_parameter(self):
-        slider_mode = self.__mixer_controller.slider_mode()
+        return self.__mixer_controller.slider_parameters()[self.__index]
+
+    def parameter_for_slider_mode(self, slider_mode):
         if self.__assigned_track:
             if slider_mode == SLIDER_MODE_VOLUME:
                 return self.__assigned_track.mixer_device.volume
@@ -411,25 +526,21 @@ class MixerChannelStrip(object):
     def take_control_of_lower_button(self, take_control):
         if self.__mixer_controller.support_mkII():
             self.__mixer_controller.remote_sl_parent().send_midi(
-                (self.__mixer_controller.cc_status_byte(), self.__index + MX_LOWER_BUTTON_ROW_BASE_CC, 0))
+                cc_message(self.__index + MX_LOWER_BUTTON_ROW_BASE_CC, 0))
         self.__control_lower_button = take_control
-        if MX_UPPER_BUTTON_TYPE == 'MUTE':
-            self._on_mute_changed()
-        elif MX_UPPER_BUTTON_TYPE == 'SOLO':
-            self._on_solo_changed()
-        if MX_LOWER_BUTTON_TYPE == 'ARM':
-            self._on_arm_changed()
+        self.refresh_leds()
 
     def upper_button_pressed(self):
         if self.__assigned_track:
-            if self.__assigned_track in tuple(self.song().visible_tracks) + tuple(self.song().return_tracks):
+            track_list = self.__mixer_controller.track_list()
+            if track_list.is_visible_track(self.__assigned_track) or track_list.is_return_track(self.__assigned_track):
                 if MX_UPPER_BUTTON_TYPE == 'MUTE':
                     self.__assigned_track.mute = not self.__assigned_track.mute
                 elif MX_UPPER_BUTTON_TYPE == 'SOLO':
                     self.__assigned_track.solo = not self.__assigned_track.solo
 
     def lower_button_pressed(self):
-        if self.__assigned_track in self.song().visible_tracks:
+        if self.__mixer_controller.track_list().is_visible_track(self.__assigned_track):
             if MX_LOWER_BUTTON_TYPE == 'ARM' and self.__assigned_track.can_be_armed:
                 self.__mixer_controller.track_about_to_arm(
                     self.__assigned_track)
@@ -442,26 +553,36 @@ class MixerChannelStrip(object):
                 self.__mixer_controller.set_selected_track(
                     self.__assigned_track)
 
+    def __is_mixable_track(self):
+        u"""True if the assigned track is a regular or return track of the song.
+        """
+        track_list = self.__mixer_controller.track_list()
+        return track_list.is_regular_track(self.__assigned_track) or track_list.is_return_track(self.__assigned_track)
+
+    def _on_name_changed(self):
+        self.__mixer_controller.strip_name_changed(
+            self.__index, self.__assigned_track.name)
+
     def _on_mute_changed(self):
         if self.__mixer_controller.support_mkII():
             value = 0
-            if self.__assigned_track in tuple(self.song().tracks) + tuple(self.song().return_tracks) and not self.__assigned_track.mute:
+            if self.__is_mixable_track() and not self.__assigned_track.mute:
                 value = 1
             self.__mixer_controller.remote_sl_parent().send_midi(
-                (self.__mixer_controller.cc_status_byte(), self.__index + MX_UPPER_BUTTON_ROW_BASE_CC, value))
+                cc_message(self.__index + MX_UPPER_BUTTON_ROW_BASE_CC, value))
 
     def _on_solo_changed(self):
         if self.__mixer_controller.support_mkII():
             value = 0
-            if self.__assigned_track in tuple(self.song().tracks) + tuple(self.song().return_tracks) and self.__assigned_track.solo:
+            if self.__is_mixable_track() and self.__assigned_track.solo:
                 value = 1
             self.__mixer_controller.remote_sl_parent().send_midi(
-                (self.__mixer_controller.cc_status_byte(), self.__index + MX_UPPER_BUTTON_ROW_BASE_CC, value))
+                cc_message(self.__index + MX_UPPER_BUTTON_ROW_BASE_CC, value))
 
     def _on_arm_changed(self):
-        if self.__control_lower_button and self.__mixer_controller.support_mkII():
+        if not MX_METERS and self.__control_lower_button and self.__mixer_controller.support_mkII():
             value = 0
-            if self.__assigned_track and self.__assigned_track in self.song().tracks and self.__assigned_track.can_be_armed and self.__assigned_track.arm:
+            if self.__assigned_track and self.__mixer_controller.is_track_armed(self.__assigned_track):
                 value = 1
-            self.__mixer_controller.remote_sl_parent().send_midi((self.__mixer_controller.cc_status_byte(),
-                                                                  self.__index + MX_LOWER_BUTTON_ROW_BASE_CC, value))
+            self.__mixer_controller.remote_sl_parent().send_midi(
+                cc_message(self.__index + MX_LOWER_BUTTON_ROW_BASE_CC, value))
@@ -0,0 +1,107 @@
+from __future__ import absolute_import, print_function, unicode_literals
+from builtins import range
+from builtins import object
+
+from .MidiMessages import cc_message
+from .consts import *
+
+
+METER_OFF = 0
+METER_SIGNAL = 1
+METER_CLIP = 2
+
+
+class MixerMeters(object):
+    u"""Shows the output meters of the mixer strips' tracks on the lower button
+    LEDs: lit while there is signal, blinking after the track clipped.
+
+    Every update only reads the meters of MX_METER_TRACKS_PER_TICK tracks, in
+    turn. A strip's state only changes when its level crosses a threshold
+    (with some hysteresis), and at most MX_METER_LEDS_PER_TICK LED messages are
+    sent per update; the others follow in the next updates.
+    """
+
+    def __init__(self, send_midi):
+        self.__send_midi = send_midi
+        self.__tracks = [None for x in range(NUM_CONTROLS_PER_ROW)]
+        self.__states = [METER_OFF for x in range(NUM_CONTROLS_PER_ROW)]
+        self.__clip_ticks = [0 for x in range(NUM_CONTROLS_PER_ROW)]
+        self.__sent_values = [None for x in range(NUM_CONTROLS_PER_ROW)]
+        self.__next_sampled_strip = 0
+        self.__next_sent_strip = 0
+        self.__ticks = 0
+        self.__enabled = True
+
+    def set_tracks(self, tracks):
+        u"""'tracks' are the tracks of the strips, None for empty strips.
+        """
+        for index in range(NUM_CONTROLS_PER_ROW):
+            track = tracks[index] if index < len(tracks) else None
+            if self.__tracks[index] != track:
+                self.__tracks[index] = track
+                self.__states[index] = METER_OFF
+                self.__clip_ticks[index] = 0
+
+    def set_enabled(self, enabled):
+        u"""While disabled (the lower buttons belong to the transport), no LEDs
+        are sent. Once enabled again, all LEDs are sent.
+        """
+        self.__enabled = enabled
+        self.invalidate()
+
+    def invalidate(self):
+        self.__sent_values = [None for x in range(NUM_CONTROLS_PER_ROW)]
+
+    def update(self):
+        if not self.__enabled:
+            return
+        self.__ticks += 1
+        for x in range(MX_METER_TRACKS_PER_TICK):
+            self.__sample(self.__next_sampled_strip)
+            self.__next_sampled_strip = (self.__next_sampled_strip + 1) % NUM_CONTROLS_PER_ROW
+        for index in range(NUM_CONTROLS_PER_ROW):
+            if self.__clip_ticks[index] > 0:
+                self.__clip_ticks[index] -= 1
+        self.__send_leds()
+
+    def __sample(self, index):
+        track = self.__tracks[index]
+        if track is None:
+            self.__states[index] = METER_OFF
+            return
+        if MX_METER_SOURCE == 'STEREO':
+            level = max(track.output_meter_left, track.output_meter_right)
+        else:
+            level = track.output_meter_level
+        state = self.__states[index]
+        if level >= MX_METER_CLIP_LEVEL:
+            self.__clip_ticks[index] = MX_METER_CLIP_HOLD_TICKS
+        if state == METER_OFF and level >= MX_METER_SIGNAL_ON_LEVEL:
+            state = METER_SIGNAL
+        elif state != METER_OFF and level < MX_METER_SIGNAL_OFF_LEVEL:
+            state = METER_OFF
+        if self.__clip_ticks[index] > 0:
+            state = METER_CLIP
+        elif state == METER_CLIP:
+            state = METER_SIGNAL
+        self.__states[index] = state
+
+    def __led_value(self, index):
+        state = self.__states[index]
+        if state == METER_CLIP:
+            return int(self.__ticks // MX_METER_BLINK_TICKS % 2 == 0)
+        return int(state == METER_SIGNAL)
+
+    def __send_leds(self):
+        budget = MX_METER_LEDS_PER_TICK
+        start = self.__next_sent_strip
+        for n in range(NUM_CONTROLS_PER_ROW):
+            if budget == 0:
+                break
+            index = (start + n) % NUM_CONTROLS_PER_ROW
+            value = self.__led_value(index)
+            if self.__sent_values[index] != value:
+                self.__sent_values[index] = value
+                self.__send_midi(cc_message(index + MX_LOWER_BUTTON_ROW_BASE_CC, value))
+                budget -= 1
+                self.__next_sent_strip = (index + 1) % NUM_CONTROLS_PER_ROW
@@ -0,0 +1,61 @@
+# Generated by tools/build_operator_banks.py from OperatorParameters.xlsx, do not edit.
+from __future__ import absolute_import, print_function, unicode_literals
+
+OPERATOR_CLASS_NAME = u'Operator'
+OPERATOR_PARAMETER_COUNT = 195
+
+# The indices into device.parameters of the parameters of each bank
+OPERATOR_BANKS = (
+    (1, 4, 8, 2, 9, 5, 120, 11),  # Global: Algorithm, Volume, Tone, Transpose, Spread, Panorama, Time, Glide Time
+    (20, 13, 14, 17, 18, 25, 26, 23),  # Osc A: Osc-A Level, A Coarse, A Fine, A Fix On, A Fix Freq, Osc-A Wave, Osc-A Feedb, Osc-A Lev < Vel
+    (29, 31, 33, 34, 30, 32, 35, 36),  # Env A: Ae Attack, Ae Decay, Ae Sustain, Ae Release, Ae Init, Ae Peak, Ae Mode, Ae Loop
+    (47, 40, 41, 44, 45, 52, 53, 50),  # Osc B: Osc-B Level, B Coarse, B Fine, B Fix On, B Fix Freq, Osc-B Wave, Osc-B Feedb, Osc-B Lev < Vel
+    (56, 58, 60, 61, 57, 59, 62, 63),  # Env B: Be Attack, Be Decay, Be Sustain, Be Release, Be Init, Be Peak, Be Mode, Be Loop
+    (74, 67, 68, 71, 72, 79, 80, 77),  # Osc C: Osc-C Level, C Coarse, C Fine, C Fix On, C Fix Freq, Osc-C Wave, Osc-C Feedb, Osc-C Lev < Vel
+    (83, 85, 87, 88, 84, 86, 89, 90),  # Env C: Ce Attack, Ce Decay, Ce Sustain, Ce Release, Ce Init, Ce Peak, Ce Mode, Ce Loop
+    (101, 94, 95, 98, 99, 106, 107, 104),  # Osc D: Osc-D Level, D Coarse, D Fine, D Fix On, D Fix Freq, Osc-D Wave, Osc-D Feedb, Osc-D Lev < Vel
+    (110, 112, 114, 115, 111, 113, 116, 117),  # Env D: De Attack, De Decay, De Sustain, De Release, De Init, De Peak, De Mode, De Loop
+    (165, 166, 170, 171, 173, 172, 174, 175),  # Filter: Filter On, Filter Type, Filter Freq, Filter Res, Filter Drive, Filter Morph, Filt < Vel, Filt < Key
+    (176, 178, 181, 184, 185, 179, 182, 186),  # Filter Env: Fe Amount, Fe Attack, Fe Decay, Fe Sustain, Fe Release, Fe Init, Fe Peak, Fe End
+    (141, 142, 144, 143, 148, 145, 150, 177),  # LFO: LFO On, LFO Type, LFO Rate, LFO Range, LFO Amt, LFO Sync, LFO Dst B, Filt < LFO
+    (154, 156, 158, 159, 155, 157, 160, 161),  # LFO Env: Le Attack, Le Decay, Le Sustain, Le Release, Le Init, Le Peak, Le End, Le Mode
+    (122, 137, 123, 126, 129, 130, 124, 127),  # Pitch Env: Pe On, Pe Amount, Pe Attack, Pe Decay, Pe Sustain, Pe Release, Pe Init, Pe Peak
+    (192, 194, 193, 6, 7, 3, 10, 121),  # Shaper / Misc: Shaper Type, Shaper Drive, Shaper Mix, Pan < Key, Pan < Rnd, PB Range, Glide On, Time < Key
+)
+
+# The original names of the parameters of each bank, to check the indices
+OPERATOR_BANK_PARAMETER_NAMES = (
+    (u'Algorithm', u'Volume', u'Tone', u'Transpose', u'Spread', u'Panorama', u'Time', u'Glide Time'),
+    (u'Osc-A Level', u'A Coarse', u'A Fine', u'A Fix On', u'A Fix Freq', u'Osc-A Wave', u'Osc-A Feedb', u'Osc-A Lev < Vel'),
+    (u'Ae Attack', u'Ae Decay', u'Ae Sustain', u'Ae Release', u'Ae Init', u'Ae Peak', u'Ae Mode', u'Ae Loop'),
+    (u'Osc-B Level', u'B Coarse', u'B Fine', u'B Fix On', u'B Fix Freq', u'Osc-B Wave', u'Osc-B Feedb', u'Osc-B Lev < Vel'),
+    (u'Be Attack', u'Be Decay', u'Be Sustain', u'Be Release', u'Be Init', u'Be Peak', u'Be Mode', u'Be Loop'),
+    (u'Osc-C Level', u'C Coarse', u'C Fine', u'C Fix On', u'C Fix Freq', u'Osc-C Wave', u'Osc-C Feedb', u'Osc-C Lev < Vel'),
+    (u'Ce Attack', u'Ce Decay', u'Ce Sustain', u'Ce Release', u'Ce Init', u'Ce Peak', u'Ce Mode', u'Ce Loop'),
+    (u'Osc-D Level', u'D Coarse', u'D Fine', u'D Fix On', u'D Fix Freq', u'Osc-D Wave', u'Osc-D Feedb', u'Osc-D Lev < Vel'),
+    (u'De Attack', u'De Decay', u'De Sustain', u'De Release', u'De Init', u'De Peak', u'De Mode', u'De Loop'),
+    (u'Filter On', u'Filter Type', u'Filter Freq', u'Filter Res', u'Filter Drive', u'Filter Morph', u'Filt < Vel', u'Filt < Key'),
+    (u'Fe Amount', u'Fe Attack', u'Fe Decay', u'Fe Sustain', u'Fe Release', u'Fe Init', u'Fe Peak', u'Fe End'),
+    (u'LFO On', u'LFO Type', u'LFO Rate', u'LFO Range', u'LFO Amt', u'LFO Sync', u'LFO Dst B', u'Filt < LFO'),
+    (u'Le Attack', u'Le Decay', u'Le Sustain', u'Le Release', u'Le Init', u'Le Peak', u'Le End', u'Le Mode'),
+    (u'Pe On', u'Pe Amount', u'Pe Attack', u'Pe Decay', u'Pe Sustain', u'Pe Release', u'Pe Init', u'Pe Peak'),
+    (u'Shaper Type', u'Shaper Drive', u'Shaper Mix', u'Pan < Key', u'Pan < Rnd', u'PB Range', u'Glide On', u'Time < Key'),
+)
+
+OPERATOR_BANK_NAMES = (
+    u'Global',
+    u'Osc A',
+    u'Env A',
+    u'Osc B',
+    u'Env B',
+    u'Osc C',
+    u'Env C',
+    u'Osc D',
+    u'Env D',
+    u'Filter',
+    u'Filter Env',
+    u'LFO',
+    u'LFO Env',
+    u'Pitch Env',
+    u'Shaper / Misc',
+)
@@ -1,15 +1,18 @@
 from __future__ import absolute_import, print_function, unicode_literals
 from builtins import str
 from builtins import object
-from datetime import datetime
-import os
 
 import Live
 import MidiRemoteScript
 
 from .EffectController import EffectController
 from .MixerController import MixerController
+from .SurfaceLink import SurfaceLink
 from .DisplayController import DisplayController
+from .MidiRouter import MidiRouter
+from .MidiOutput import MidiOutput
+from .Instrumentation import instrumentation, timed
+from .Logger import acquire_logger, release_logger
 from .consts import *
 from _Generic.util import DeviceAppointer
 
@@ -21,7 +24,16 @@ class RemoteSL(object):
 
     def __init__(self, c_instance):
         self.__c_instance = c_instance
+        self.__logger = acquire_logger()
         self.__automap_has_control = False
+        self.__rebuild_requested = False
+        self.__forced_rebuild_requested = False
+        self.__mapped_signature = None
+        if INSTRUMENTATION:
+            self.__midi_output = MidiOutput(
+                instrumentation.counted_sender(c_instance.send_midi))
+        else:
+            self.__midi_output = MidiOutput(c_instance.send_midi)
         self.__display_controller = DisplayController(self)
         self.__effect_controller = EffectController(
             self, self.__display_controller)
@@ -29,6 +41,7 @@ class RemoteSL(object):
             self, self.__display_controller)
         self.__components = [self.__effect_controller,
                              self.__mixer_controller, self.__display_controller]
+        self.__midi_router = self.__create_midi_router()
         self.__update_hardware_delay = -1
         self._device_appointer = DeviceAppointer(
             song=self.song(), appointed_device_setter=self._set_appointed_device)
@@ -42,6 +55,10 @@ class RemoteSL(object):
         self._device_appointer.disconnect()
         self.send_midi(ALL_LEDS_OFF_MESSAGE)
         self.send_midi(GOOD_BYE_SYSEX_MESSAGE)
+        self.__midi_output.flush_all()
+        if INSTRUMENTATION:
+            instrumentation.dump()
+        release_logger()
 
     def application(self):
         u"""returns a reference to the application that we are running in
@@ -71,24 +88,30 @@ class RemoteSL(object):
         """
         return True
 
+    @timed(u'RemoteSL.lock_to_device')
     def lock_to_device(self, device):
         u"""Live -> Script
         Live can tell the script to lock to a given device
         """
         self.__effect_controller.lock_to_device(device)
+        self.__end_of_callback()
 
+    @timed(u'RemoteSL.unlock_from_device')
     def unlock_from_device(self, device):
         u"""Live -> Script
         Live can tell the script to unlock from a given device
         """
         self.__effect_controller.unlock_from_device(device)
+        self.__end_of_callback()
 
+    @timed(u'RemoteSL.set_appointed_device')
     def _set_appointed_device(self, device):
         u"""Live -> Script
         Live can tell the script which device to use if it is not locked
         This is a substitute mechanism for the listeners used by older scripts
         """
         self.__effect_controller.set_appointed_device(device)
+        self.__end_of_callback()
 
     def toggle_lock(self):
         u"""Script -> Live
@@ -107,6 +130,7 @@ class RemoteSL(object):
 
     def restore_bank(self, bank):
         self.__effect_controller.restore_bank(bank)
+        self.__end_of_callback()
 
     def supports_pad_translation(self):
         return True
@@ -122,23 +146,48 @@ class RemoteSL(object):
         Called by the Application as soon as all scripts are initialized.
         You can connect yourself to other running scripts here, as we do it
         connect the extension modules (MackieControlXTs).
+        With LINK_SCRIPT_INSTANCES, the mixers of all RemoteSLs are linked to one
+        surface, in the order of the scripts in Live's list.
         """
-        pass
-
-    def request_rebuild_midi_map(self):
+        if LINK_SCRIPT_INSTANCES:
+            units = [s for s in instanciated_scripts if isinstance(s, RemoteSL)]
+            if len(units) > 1 and units[0] is self:
+                surface = SurfaceLink(self.song())
+                for unit in units:
+                    unit.link_mixer_to(surface)
+                surface.notify_units()
+        self.__end_of_callback()
+
+    def link_mixer_to(self, surface):
+        self.__mixer_controller.set_surface(surface)
+
+    def request_rebuild_midi_map(self, force=False):
         u"""When the internal MIDI controller has changed in a way that you need to rebuild
         the MIDI mappings, request a rebuild by calling this function
         This is processed as a request, to be sure that its not too often called, because
         its time-critical.
+        The requests are collected, and passed on to Live at the end of the current
+        callback from Live, or with the next update_display, but only when the
+        mapping would actually change (or 'force' was given).
         """
-        self.__c_instance.request_rebuild_midi_map()
+        self.__rebuild_requested = True
+        if force:
+            self.__forced_rebuild_requested = True
 
     def send_midi(self, midi_event_bytes):
         u"""Use this function to send MIDI events through Live to the _real_ MIDI devices
         that this script is assigned to.
+        The events are collected, and sent at the end of the current callback from
+        Live, or with the next update_display.
         """
         if not self.__automap_has_control:
-            self.__c_instance.send_midi(midi_event_bytes)
+            self.__midi_output.send(midi_event_bytes)
+
+    def force_midi_resync(self):
+        u"""Forget what we think the controller is showing, so that the next LED
+        updates are all sent, even if they seem to be unchanged.
+        """
+        self.__midi_output.invalidate()
 
     def refresh_state(self):
         u"""Send out MIDI to completely update the attached MIDI controller.
@@ -149,10 +198,14 @@ class RemoteSL(object):
 
     def __update_hardware(self):
         self.__automap_has_control = False
+        self.force_midi_resync()
         self.send_midi(WELCOME_SYSEX_MESSAGE)
         for c in self.__components:
             c.refresh_state()
+        # the encoder feedback is only sent when the map is built
+        self.request_rebuild_midi_map(force=True)
 
+    @timed(u'RemoteSL.build_midi_map')
     def build_midi_map(self, midi_map_handle):
         u"""Build DeviceParameter Mappings, that are processed in Audio time, or
         forward MIDI messages explicitly to our receive_midi_functions.
@@ -163,8 +216,13 @@ class RemoteSL(object):
             for c in self.__components:
                 c.build_midi_map(self.__c_instance.handle(), midi_map_handle)
 
+        self.__mapped_signature = self.__midi_map_signature()
+        self.__rebuild_requested = False
+        self.__forced_rebuild_requested = False
         self.__c_instance.set_pad_translation(PAD_TRANSLATION)
+        self.__midi_output.flush()
 
+    @timed(u'RemoteSL.update_display')
     def update_display(self):
         u"""Aka on_timer. Called every 100 ms and should be used to update display relevant
         parts of the controller only...
@@ -176,35 +234,33 @@ class RemoteSL(object):
                 self.__update_hardware_delay = -1
         for c in self.__components:
             c.update_display()
+        self.__pass_on_rebuild_request()
+        self.__midi_output.tick()
+        if INSTRUMENTATION:
+            instrumentation.end_tick()
 
+    @timed(u'RemoteSL.receive_midi')
     def receive_midi(self, midi_bytes):
         u"""MIDI messages are only received through this function, when explicitly
         forwarded in 'build_midi_map'.
         """
-        if midi_bytes[0] & 240 in (NOTE_ON_STATUS, NOTE_OFF_STATUS):
-            channel = midi_bytes[0] & 15
-            note = midi_bytes[1]
-            velocity = midi_bytes[2]
-            if note in fx_notes:
-                self.__effect_controller.receive_midi_note(note, velocity)
-            elif note in mx_notes:
-                self.__mixer_controller.receive_midi_note(note, velocity)
-            else:
-                print(u'unknown MIDI message %s' % str(midi_bytes))
-        elif midi_bytes[0] & 240 == CC_STATUS:
-            channel = midi_bytes[0] & 15
-            cc_no = midi_bytes[1]
-            cc_value = midi_bytes[2]
-            if cc_no in fx_ccs:
-                self.__effect_controller.receive_midi_cc(cc_no, cc_value)
-            elif cc_no in mx_ccs:
-                self.__mixer_controller.receive_midi_cc(cc_no, cc_value)
-            else:
-                print(u'unknown MIDI message %s' % str(midi_bytes))
-        elif midi_bytes[0] == 240:
+        if INSTRUMENTATION:
+            midi_messages, dump_requested = instrumentation.midi_received(midi_bytes)
+            if dump_requested:
+                instrumentation.dump()
+                self.show_message(u'RemoteSL: stats written')
+            for midi_message in midi_messages:
+                self.__handle_midi(midi_message)
+        else:
+            self.__handle_midi(midi_bytes)
+        self.__end_of_callback()
+
+    def __handle_midi(self, midi_bytes):
+        if midi_bytes[0] == 240:
             if len(midi_bytes) == 13 and midi_bytes[1:4] == (0, 32, 41):
                 if midi_bytes[8] == ABLETON_PID and midi_bytes[10] == 1:
                     self.__automap_has_control = midi_bytes[11] == 0
+                    self.force_midi_resync()
                     support_mkII = midi_bytes[6] * 100 + midi_bytes[7] >= 1800
                     if not self.__automap_has_control:
                         self.send_midi(ALL_LEDS_OFF_MESSAGE)
@@ -213,16 +269,44 @@ class RemoteSL(object):
                         if not self.__automap_has_control:
                             c.refresh_state()
 
-                    self.request_rebuild_midi_map()
+                    self.request_rebuild_midi_map(force=True)
         else:
-            print(u'unknown MIDI message %s' % str(midi_bytes))
-
-    def log(self, *messages):
-        dir_name = os.path.dirname(os.path.abspath(__file__))
-        now = datetime.now()
+            self.__midi_router.route(midi_bytes)
+
+    def __end_of_callback(self):
+        self.__pass_on_rebuild_request()
+        self.__midi_output.flush()
+
+    def __pass_on_rebuild_request(self):
+        if self.__rebuild_requested:
+            if self.__forced_rebuild_requested or self.__midi_map_signature() != self.__mapped_signature:
+                self.__c_instance.request_rebuild_midi_map()
+            self.__rebuild_requested = False
+            self.__forced_rebuild_requested = False
+
+    def __midi_map_signature(self):
+        return (self.__automap_has_control,
+                tuple([c.midi_map_signature() for c in self.__components]))
+
+    def __create_midi_router(self):
+        router = MidiRouter(self.__on_unknown_midi)
+        router.add_note_handlers(
+            fx_notes, self.__effect_controller.note_handler)
+        router.add_cc_handlers(fx_ccs, self.__effect_controller.cc_handler)
+        router.add_cc_handlers(mx_ccs, self.__mixer_controller.cc_handler)
+        return router
+
+    def __on_unknown_midi(self, midi_bytes):
+        print(u'unknown MIDI message %s' % str(midi_bytes))
+
+    def log(self, *messages, level=LOG_INFO):
+        u"""Appends one line per message to Log.txt (an empty one for empty
+        messages). The file is written in the background, see Logger.
+        """
+        self.__logger.log(level, *messages)
 
-        with open(os.path.join(dir_name, 'Log.txt'), 'a') as file:
-            for message in messages:
-                if message:
-                    file.write(f'{now.strftime("%d/%m/%Y %H:%M")} {str(message)}')
-                file.write('\n')
+    def log_enabled(self, level):
+        u"""False if messages of 'level' are dropped anyway, so callers can skip
+        formatting them.
+        """
+        return self.__logger.is_enabled_for(level)
@@ -23,6 +23,9 @@ class RemoteSLComponent(object):
     def send_midi(self, midi_event_bytes):
         self.__parent.send_midi(midi_event_bytes)
 
+    def force_midi_resync(self):
+        self.__parent.force_midi_resync()
+
     def request_rebuild_midi_map(self):
         self.__parent.request_rebuild_midi_map()
 
@@ -32,20 +35,26 @@ class RemoteSLComponent(object):
     def build_midi_map(self, script_handle, midi_map_handle):
         pass
 
+    def midi_map_signature(self):
+        u"""Returns something comparable that changes whenever build_midi_map
+        would map or forward differently, so that unneeded rebuilds are skipped.
+        """
+        return ()
+
     def refresh_state(self):
         pass
 
     def update_display(self):
         pass
 
-    def cc_status_byte(self):
-        return CC_STATUS + SL_MIDI_CHANNEL
-
     def support_mkII(self):
         return self.__support_mkII
 
     def set_support_mkII(self, support_mkII):
         self.__support_mkII = support_mkII
 
-    def log(self, *messages):
-        return self.__parent.log(*messages)
+    def log(self, *messages, level=LOG_INFO):
+        return self.__parent.log(*messages, level=level)
+
+    def log_enabled(self, level):
+        return self.__parent.log_enabled(level)
@@ -0,0 +1,94 @@
+from __future__ import absolute_import, print_function, unicode_literals
+from builtins import object
+import math
+import time
+
+from .consts import *
+
+
+SCRUB_REWIND = -1
+SCRUB_FORWARD = 1
+
+
+class Scrubber(object):
+    u"""Moves the song position while the rewind or forward button is held.
+
+    The distance moved is computed from the time the button is held, not from
+    the number of timer ticks: the speed starts at SCRUB_START_SPEED and follows
+    SCRUB_CURVE up to SCRUB_TOP_SPEED (beats per second), so a late or skipped
+    update_display only makes the next step bigger. When the button is released,
+    the position can snap to the next bar or locator (SCRUB_SNAP).
+    """
+
+    def __init__(self, song, clock=time.monotonic):
+        self.__song = song
+        self.__clock = clock
+        self.__direction = 0
+        self.__start_time = None
+        self.__distance = 0.0
+
+    def start(self, direction):
+        assert direction in (SCRUB_REWIND, SCRUB_FORWARD)
+        self.__direction = direction
+        self.__start_time = self.__clock()
+        self.__distance = 0.0
+
+    def stop(self, direction):
+        if self.__direction == direction:
+            self.update()
+            self.__direction = 0
+            self.__start_time = None
+            self.__snap(direction)
+
+    def update(self):
+        u"""Jumps by the distance the song position should have moved since the
+        last update.
+        """
+        if self.__direction:
+            distance = scrub_distance(self.__clock() - self.__start_time)
+            beats = distance - self.__distance
+            if beats > 0.0:
+                self.__distance = distance
+                self.__song.jump_by(self.__direction * beats)
+
+    def __snap(self, direction):
+        song = self.__song
+        position = song.current_song_time
+        target = None
+        if SCRUB_SNAP == 'BAR':
+            beats_per_bar = 4.0 * song.signature_numerator / song.signature_denominator
+            if direction == SCRUB_FORWARD:
+                target = math.ceil(position / beats_per_bar) * beats_per_bar
+            else:
+                target = math.floor(position / beats_per_bar) * beats_per_bar
+        elif SCRUB_SNAP == 'LOCATOR':
+            times = [cue_point.time for cue_point in song.cue_points]
+            if direction == SCRUB_FORWARD:
+                times = [t for t in times if t >= position]
+                if times:
+                    target = min(times)
+            else:
+                times = [t for t in times if t <= position]
+                if times:
+                    target = max(times)
+        if target is not None and target != position:
+            song.jump_by(target - position)
+
+
+def scrub_distance(seconds):
+    u"""Returns how many beats the position moves when a button is held for
+    'seconds', by integrating the speed of SCRUB_CURVE over that time.
+    """
+    start_speed = float(SCRUB_START_SPEED)
+    top_speed = float(max(SCRUB_TOP_SPEED, SCRUB_START_SPEED))
+    ramp_time = float(SCRUB_ACCELERATION_TIME)
+    if SCRUB_CURVE == 'CONSTANT' or ramp_time <= 0.0 or top_speed == start_speed:
+        return start_speed * seconds
+    ramp = min(seconds, ramp_time)
+    if SCRUB_CURVE == 'LINEAR':
+        distance = start_speed * ramp + (top_speed - start_speed) * ramp * ramp / (2.0 * ramp_time)
+    else:
+        assert SCRUB_CURVE == 'EXPONENTIAL', u'unknown SCRUB_CURVE ' + SCRUB_CURVE
+        growth = math.log(top_speed / start_speed) / ramp_time
+        distance = start_speed * (math.exp(growth * ramp) - 1.0) / growth
+    return distance + top_speed * max(0.0, seconds - ramp_time)
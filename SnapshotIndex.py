@@ -0,0 +1,50 @@
+from __future__ import absolute_import, print_function, unicode_literals
+from builtins import range
+from builtins import object
+
+from .consts import *
+
+
+class SnapshotIndex(object):
+    u"""The snapshots of the devices of one track, stored in the track's data.
+
+    A device's snapshots are kept in slots 0, 1, ... (under the key of the
+    device followed by the slot), the first empty slot is the next one to save.
+    Reading a snapshot means deserialising all of its parameter values, so the
+    number of taken slots is only probed once per device key, and then counted
+    here when a snapshot is saved. All snapshots of the track must be saved
+    through this index.
+    """
+
+    def __init__(self, track):
+        self.__track = track
+        self.__counts = {}
+
+    def track(self):
+        return self.__track
+
+    def count(self, device_key):
+        u"""The number of taken slots of the device with 'device_key'.
+        """
+        count = self.__counts.get(device_key)
+        if count is None:
+            count = 0
+            for slot in range(NUM_CONTROLS_PER_ROW):
+                if not self.__track.get_data(snapshot_key(device_key, slot), None):
+                    break
+                count += 1
+            self.__counts[device_key] = count
+        return count
+
+    def load(self, device_key, slot):
+        return self.__track.get_data(snapshot_key(device_key, slot), None)
+
+    def save(self, device_key, slot, parameter_values):
+        assert slot == self.count(device_key), u'snapshots are saved into the first empty slot'
+        self.__track.set_data(snapshot_key(device_key, slot), parameter_values)
+        if parameter_values:
+            self.__counts[device_key] = slot + 1
+
+
+def snapshot_key(device_key, slot):
+    return f'{device_key}_{str(slot)}'
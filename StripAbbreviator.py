@@ -0,0 +1,81 @@
+from __future__ import absolute_import, print_function, unicode_literals
+from builtins import object
+from collections import OrderedDict
+
+from .consts import *
+
+
+STRIP_CACHE_SIZE = 1024
+
+
+class _AsciiTable(dict):
+    u"""Translate table that maps all characters the display can not show (non
+    ASCII) to a space. Entries are created on first use.
+    """
+
+    def __missing__(self, key):
+        if key > 127:
+            value = self[key] = u' '
+        else:
+            value = self[key] = key
+        return value
+
+
+class StripAbbreviator(object):
+    u"""Squeezes strings into one display strip: NUM_CHARS_PER_DISPLAY_STRIP - 1
+    characters plus one space as separator.
+
+    Results are kept in a bounded LRU cache, since the same strings (track and
+    parameter names, values like '0.0 dB') are shown over and over again. One
+    instance is shared by the left and the right display.
+    """
+
+    def __init__(self, cache_size=STRIP_CACHE_SIZE):
+        self.__cache = OrderedDict()
+        self.__cache_size = cache_size
+        self.__ascii_table = _AsciiTable()
+        self.hits = 0
+        self.misses = 0
+
+    def generate(self, display_string):
+        try:
+            result = self.__cache[display_string]
+        except KeyError:
+            self.misses += 1
+            result = self.__abbreviate(display_string)
+            self.__cache[display_string] = result
+            if len(self.__cache) > self.__cache_size:
+                self.__cache.popitem(last=False)
+        else:
+            self.hits += 1
+            self.__cache.move_to_end(display_string)
+        return result
+
+    def clear(self):
+        self.__cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __abbreviate(self, display_string):
+        u""" Hack: Shamelessly stolen from the MainDisplayController of the Mackie Control.
+
+        Returns the strip string of the passed string, trying to remove not so
+        important letters and signs first...
+        """
+        if not display_string:
+            return u' ' * NUM_CHARS_PER_DISPLAY_STRIP
+        max_length = NUM_CHARS_PER_DISPLAY_STRIP - 1
+        if len(display_string.strip()) > max_length and display_string.endswith(u'dB') and display_string.find(u'.') != -1:
+            display_string = display_string[:-2]
+        if len(display_string) > max_length:
+            for um in (u' ', u'i', u'o', u'u', u'e', u'a'):
+                um_pos = display_string.rfind(um, 1)
+                while len(display_string) > max_length and um_pos != -1:
+                    display_string = display_string[:um_pos] + display_string[um_pos + 1:]
+                    um_pos = display_string.rfind(um, 1, um_pos)
+        else:
+            display_string = display_string.center(max_length)
+        return display_string[:max_length].translate(self.__ascii_table) + u' '
+
+
+strip_abbreviator = StripAbbreviator()
@@ -0,0 +1,64 @@
+from __future__ import absolute_import, print_function, unicode_literals
+from builtins import object
+
+from .TrackListCache import TrackListCache
+from .consts import *
+
+
+class SurfaceLink(object):
+    u"""Joins the mixers of several RemoteSL units into one wide mixer surface.
+
+    Each unit has NUM_CONTROLS_PER_ROW strips; unit n shows the tracks right
+    after the ones of unit n - 1, and paging on any unit moves the whole
+    surface. All units share the link's track list, so the song's track lists
+    are only observed (and read) once.
+
+    A mixer that is not linked to others is the only unit of its own link.
+    """
+
+    def __init__(self, song):
+        self.__track_list = TrackListCache(song)
+        self.__units = []
+        self.__strip_offset = 0
+
+    def disconnect(self):
+        self.__track_list.disconnect()
+        self.__units = []
+
+    def track_list(self):
+        return self.__track_list
+
+    def add_unit(self, unit):
+        self.__units.append(unit)
+
+    def remove_unit(self, unit):
+        self.__units.remove(unit)
+
+    def has_units(self):
+        return len(self.__units) > 0
+
+    def unit_offset(self, unit):
+        u"""The index of the first track of 'unit' in the track list.
+        """
+        return self.__strip_offset + self.__units.index(unit) * NUM_CONTROLS_PER_ROW
+
+    def num_strips(self):
+        return len(self.__units) * NUM_CONTROLS_PER_ROW
+
+    def strip_offset(self):
+        return self.__strip_offset
+
+    def set_strip_offset(self, strip_offset):
+        u"""Moves the surface, and lets all units show their new tracks.
+        """
+        if strip_offset != self.__strip_offset:
+            self.__strip_offset = strip_offset
+            self.notify_units()
+
+    def validate_strip_offset(self):
+        num_tracks = len(self.__track_list.tracks())
+        self.__strip_offset = max(0, min(self.__strip_offset, num_tracks - 1))
+
+    def notify_units(self):
+        for unit in list(self.__units):
+            unit.surface_changed()
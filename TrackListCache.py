@@ -0,0 +1,110 @@
+from __future__ import absolute_import, print_function, unicode_literals
+from builtins import object
+
+
+TRACK_KIND_REGULAR = u'regular'
+TRACK_KIND_VISIBLE = u'visible'
+TRACK_KIND_RETURN = u'return'
+TRACK_KIND_MASTER = u'master'
+NO_TRACK_KINDS = frozenset()
+
+
+class TrackListCache(object):
+    u"""The tracks the mixer can show: the visible tracks, then the return tracks,
+    then the master track.
+
+    The list (and a map from track to its index in it) is only built again after
+    the visible tracks or the return tracks of the song changed, instead of on
+    every access. Listeners added with add_listener are called after the cache
+    was invalidated.
+
+    It also keeps the set of tracks of each kind (regular, visible, return and
+    master), so that membership checks like 'is this still a return track of the
+    song' don't need to search the song's track lists.
+    """
+
+    def __init__(self, song):
+        self.__song = song
+        self.__tracks = None
+        self.__indices = None
+        self.__kinds = None
+        self.__listeners = []
+        self.__song.add_tracks_listener(self.__on_regular_tracks_changed)
+        self.__song.add_visible_tracks_listener(self.__on_tracks_changed)
+        self.__song.add_return_tracks_listener(self.__on_tracks_changed)
+
+    def disconnect(self):
+        self.__song.remove_tracks_listener(self.__on_regular_tracks_changed)
+        self.__song.remove_visible_tracks_listener(self.__on_tracks_changed)
+        self.__song.remove_return_tracks_listener(self.__on_tracks_changed)
+        self.__listeners = []
+
+    def add_listener(self, listener):
+        self.__listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.__listeners.remove(listener)
+
+    def tracks(self):
+        if self.__tracks is None:
+            self.__update()
+        return self.__tracks
+
+    def index_of(self, track):
+        u"""Returns the index of 'track' in tracks(), or None if it is not shown.
+        """
+        if self.__tracks is None:
+            self.__update()
+        return self.__indices.get(track)
+
+    def is_regular_track(self, track):
+        u"""True if 'track' is one of song.tracks (visible or folded away).
+        """
+        return TRACK_KIND_REGULAR in self.__kinds_of(track)
+
+    def is_visible_track(self, track):
+        return TRACK_KIND_VISIBLE in self.__kinds_of(track)
+
+    def is_return_track(self, track):
+        return TRACK_KIND_RETURN in self.__kinds_of(track)
+
+    def is_master_track(self, track):
+        return TRACK_KIND_MASTER in self.__kinds_of(track)
+
+    def invalidate(self):
+        self.__tracks = None
+        self.__indices = None
+        self.__kinds = None
+
+    def __update(self):
+        song = self.__song
+        self.__tracks = tuple(song.visible_tracks) + \
+            tuple(song.return_tracks) + (song.master_track,)
+        self.__indices = dict([(track, index)
+                               for index, track in enumerate(self.__tracks)])
+
+    def __kinds_of(self, track):
+        if self.__kinds is None:
+            self.__update_kinds()
+        return self.__kinds.get(track, NO_TRACK_KINDS)
+
+    def __update_kinds(self):
+        song = self.__song
+        kinds = {}
+        for kind, tracks in ((TRACK_KIND_REGULAR, song.tracks),
+                             (TRACK_KIND_VISIBLE, song.visible_tracks),
+                             (TRACK_KIND_RETURN, song.return_tracks),
+                             (TRACK_KIND_MASTER, (song.master_track,))):
+            for track in tracks:
+                kinds[track] = kinds.get(track, NO_TRACK_KINDS) | frozenset((kind,))
+        self.__kinds = kinds
+
+    def __on_regular_tracks_changed(self):
+        # Tracks inside folded groups are not visible, so this doesn't change
+        # what the mixer shows (Live also fires visible_tracks if it does).
+        self.__kinds = None
+
+    def __on_tracks_changed(self):
+        self.invalidate()
+        for listener in list(self.__listeners):
+            listener()
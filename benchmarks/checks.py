@@ -0,0 +1,101 @@
+u"""Behaviour checks: drives the script headless through situations that broke
+before, and fails with an AssertionError if they break again.
+
+Run from the repository root:
+    python benchmarks/checks.py
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import headless
+from headless.model import Chain, Device
+from replay import build_song
+
+
+def mapped_encoder_parameters(session):
+    consts = headless.script_module('consts')
+    return [call[1] for call in session.c_instance.midi_map.calls
+            if call[0] in (u'map_midi_cc', u'map_midi_cc_with_feedback_map') and
+            call[3] in consts.fx_encoder_row_ccs]
+
+
+def check_renamed_macro():
+    u"""Renames a macro of a rack (like users do all the time) and checks that
+    the encoders are still mapped to all macros of the rack's bank.
+    """
+    session = headless.Session(song=build_song(1, 0))
+    session.handshake()
+    song = session.song
+    rack = [device for device in song.tracks[0].devices if hasattr(device, u'chains')][0]
+    rack.parameters[1].name = u'Renamed Macro'
+    session.mutate(u'select_device', song.view.select_device, rack)
+    assert mapped_encoder_parameters(session) == list(rack.parameters[1:9]), \
+        u'the bank of a rack with a renamed macro does not resolve'
+    session.disconnect()
+
+
+def check_operator_banks():
+    u"""Selects an Operator with the parameters in the order of the spreadsheet,
+    and one where two of them swapped places: both must map the bank's
+    parameters by their names.
+    """
+    operator_banks = headless.script_module('OperatorBanks')
+    # 'Device On' is added by the fake Device
+    names = [u'Unused %d' % n for n in range(operator_banks.OPERATOR_PARAMETER_COUNT - 1)]
+    for indices, bank_names in zip(operator_banks.OPERATOR_BANKS, operator_banks.OPERATOR_BANK_PARAMETER_NAMES):
+        for index, name in zip(indices, bank_names):
+            names[index - 1] = name
+    first_bank = operator_banks.OPERATOR_BANKS[0]
+    swapped = list(names)
+    swapped[first_bank[0] - 1], swapped[first_bank[1] - 1] = swapped[first_bank[1] - 1], swapped[first_bank[0] - 1]
+    for parameter_names in (names, swapped):
+        session = headless.Session(song=build_song(1, 0))
+        session.handshake()
+        song = session.song
+        track = song.tracks[0]
+        operator = Device(u'Operator', operator_banks.OPERATOR_CLASS_NAME, parent=track,
+                          parameter_names=parameter_names)
+        session.mutate(u'add_device', setattr, track, u'devices', tuple(track.devices) + (operator,))
+        session.mutate(u'select_device', song.view.select_device, operator)
+        mapped = [parameter.original_name for parameter in mapped_encoder_parameters(session)]
+        assert mapped == list(operator_banks.OPERATOR_BANK_PARAMETER_NAMES[0]), \
+            u'the first Operator bank maps %s' % u', '.join(mapped)
+        session.disconnect()
+
+
+def check_chain_insertion():
+    u"""Selects the device in the last chain of a rack, adds a chain to the rack
+    in Live, and checks that paging to the next chain reaches the new one.
+    """
+    consts = headless.script_module('consts')
+    session = headless.Session(song=build_song(1, 0))
+    session.handshake()
+    song = session.song
+    rack = [device for device in song.tracks[0].devices if hasattr(device, u'chains')][0]
+    last_chain = rack.chains[-1]
+    session.mutate(u'select_device', song.view.select_device, last_chain.devices[0])
+    rack.view.selected_chain = last_chain
+    new_chain = Chain(u'New Chain', parent=rack)
+    new_chain.devices = (Device(u'New Device', u'AudioEffect', parent=new_chain),)
+    session.mutate(u'add_chain', setattr, rack, u'chains', tuple(rack.chains) + (new_chain,))
+    session.press(consts.MX_DISPLAY_PAGE_UP, consts.CC_VAL_BUTTON_PRESSED)
+    assert song.appointed_device == new_chain.devices[0], \
+        u'paging stayed on %s instead of the added chain' % song.appointed_device.name
+    session.disconnect()
+
+
+CHECKS = [check_renamed_macro, check_operator_banks, check_chain_insertion]
+
+
+def main():
+    for check in CHECKS:
+        check()
+        print(u'%s: ok' % check.__name__)
+
+
+if __name__ == '__main__':
+    main()
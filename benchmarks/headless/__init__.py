@@ -0,0 +1,169 @@
+u"""Runs the RemoteSL script outside of Live.
+
+install() puts the stand-ins for Live's embedded modules (Live, MidiRemoteScript,
+_Generic, _Framework, past) on sys.path and imports the script as a package.
+Session wires a fake song and c_instance to a script instance, and measures
+every callback it drives.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+import importlib.util
+import os
+import sys
+import time
+
+from .model import Song
+
+
+HEADLESS_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_DIR = os.path.dirname(os.path.dirname(HEADLESS_DIR))
+PACKAGE_NAME = 'RemoteSL_98'
+
+
+def install():
+    u"""Returns the script package, importing it (and the stand-ins) on first use.
+    """
+    if PACKAGE_NAME not in sys.modules:
+        sys.path.insert(0, os.path.join(HEADLESS_DIR, 'modules'))
+        spec = importlib.util.spec_from_file_location(
+            PACKAGE_NAME, os.path.join(SCRIPT_DIR, '__init__.py'), submodule_search_locations=[SCRIPT_DIR])
+        package = importlib.util.module_from_spec(spec)
+        sys.modules[PACKAGE_NAME] = package
+        spec.loader.exec_module(package)
+    return sys.modules[PACKAGE_NAME]
+
+
+def script_module(name):
+    install()
+    return importlib.import_module(PACKAGE_NAME + '.' + name)
+
+
+class MidiMapRecorder(object):
+    u"""Plays the midi_map_handle: records the mapping calls of one build_midi_map.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def record(self, *call):
+        self.calls.append(call)
+
+
+class FakeCInstance(object):
+    u"""Stands in for the c_instance Live passes to create_instance. Records all
+    MIDI the script sends and the MIDI map rebuilds it requests.
+    """
+
+    def __init__(self, song):
+        self._song = song
+        self.script = None
+        self.sent_midi = []
+        self.rebuild_requests = 0
+        self.messages = []
+        self.locked_device = None
+        self.midi_map = None
+
+    def song(self):
+        return self._song
+
+    def handle(self):
+        return self
+
+    def instance_identifier(self):
+        return 0
+
+    def send_midi(self, midi_event_bytes):
+        self.sent_midi.append(tuple(midi_event_bytes))
+
+    def request_rebuild_midi_map(self):
+        self.rebuild_requests += 1
+
+    def show_message(self, message):
+        self.messages.append(message)
+
+    def set_pad_translation(self, pad_translation):
+        pass
+
+    def toggle_lock(self):
+        if self.locked_device is None:
+            self.locked_device = self._song.appointed_device
+            self.script.lock_to_device(self.locked_device)
+        else:
+            device = self.locked_device
+            self.locked_device = None
+            self.script.unlock_from_device(device)
+
+
+class Session(object):
+    u"""A script instance running against a fake song.
+
+    All calls into the script go through 'call', which times them. Like Live, a
+    requested MIDI map rebuild is carried out after the callback that asked for
+    it, as a separate (timed) build_midi_map.
+    """
+
+    def __init__(self, song=None, **song_args):
+        package = install()
+        self.song = song or Song(**song_args)
+        self.c_instance = FakeCInstance(self.song)
+        self.timings = {}
+        self.script = self.__timed(u'create_instance', package.create_instance, self.c_instance)
+        self.c_instance.script = self.script
+        self.__rebuild_if_requested()
+
+    def call(self, name, *args):
+        result = self.__timed(name, getattr(self.script, name), *args)
+        self.__rebuild_if_requested()
+        return result
+
+    def mutate(self, name, function, *args):
+        u"""Changes the song outside of any script callback (like the user doing it
+        in Live). The time includes all listeners of the script that fire.
+        """
+        result = self.__timed(name, function, *args)
+        self.__rebuild_if_requested()
+        return result
+
+    def receive_midi(self, midi_bytes):
+        return self.call(u'receive_midi', tuple(midi_bytes))
+
+    def press(self, cc_no, value=127):
+        u"""Presses and releases the button that sends 'cc_no'.
+        """
+        self.receive_midi((176, cc_no, value))
+        self.receive_midi((176, cc_no, 0))
+
+    def tick(self, count=1):
+        for x in range(count):
+            self.call(u'update_display')
+
+    def handshake(self, automap_has_control=False):
+        u"""Sends the reply of an SL MkII to the welcome sysex, and runs the timer
+        until the delayed hardware refresh is done.
+        """
+        self.receive_midi((240, 0, 32, 41, 3, 3, 18, 0, 4, 0, 1, 0 if automap_has_control else 1, 247))
+        self.call(u'refresh_state')
+        self.tick(6)
+
+    def midi_bytes_sent(self):
+        return sum([len(midi_event_bytes) for midi_event_bytes in self.c_instance.sent_midi])
+
+    def reset_stats(self):
+        self.timings = {}
+        self.c_instance.sent_midi = []
+
+    def disconnect(self):
+        self.call(u'disconnect')
+
+    def __rebuild_if_requested(self):
+        if self.c_instance.rebuild_requests:
+            self.c_instance.rebuild_requests = 0
+            self.c_instance.midi_map = MidiMapRecorder()
+            self.__timed(u'build_midi_map', self.script.build_midi_map, self.c_instance.midi_map)
+
+    def __timed(self, name, function, *args):
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.timings.setdefault(name, []).append(time.perf_counter() - start)
@@ -0,0 +1,317 @@
+u"""A small stand-in for Live's object model, good enough to drive the script
+outside of Live: Song, Track, Device, RackDevice, Chain, DeviceParameter and
+friends, with the add_*_listener / remove_*_listener / *_has_listener API.
+
+Class names matter, since the script checks type(obj).__name__ in places.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+
+class Subject(object):
+    u"""Provides add_<prop>_listener, remove_<prop>_listener and
+    <prop>_has_listener for any property, and notify(prop) to fire them.
+    """
+
+    def __init__(self):
+        self._listeners = {}
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name.endswith('_has_listener'):
+            prop = name[:-len('_has_listener')]
+            return lambda listener: listener in self._listeners.get(prop, [])
+        if name.endswith('_listener'):
+            if name.startswith('add_'):
+                prop = name[len('add_'):-len('_listener')]
+                return lambda listener: self.__add_listener(prop, listener)
+            if name.startswith('remove_'):
+                prop = name[len('remove_'):-len('_listener')]
+                return lambda listener: self.__remove_listener(prop, listener)
+        raise AttributeError(name)
+
+    def __add_listener(self, prop, listener):
+        listeners = self._listeners.setdefault(prop, [])
+        assert listener not in listeners, u'listener added twice: %s' % prop
+        listeners.append(listener)
+
+    def __remove_listener(self, prop, listener):
+        listeners = self._listeners.get(prop, [])
+        assert listener in listeners, u'removing unknown listener: %s' % prop
+        listeners.remove(listener)
+
+    def notify(self, prop):
+        for listener in list(self._listeners.get(prop, [])):
+            listener()
+
+    def listener_count(self):
+        return sum([len(listeners) for listeners in self._listeners.values()])
+
+
+def observable(name):
+    u"""A property that notifies the '<name>' listeners whenever it changes.
+    """
+    attribute = '_' + name
+
+    def getter(self):
+        return getattr(self, attribute)
+
+    def setter(self, value):
+        if getattr(self, attribute) != value:
+            setattr(self, attribute, value)
+            self.notify(name)
+
+    return property(getter, setter)
+
+
+class DeviceParameter(Subject):
+    value = observable('value')
+    name = observable('name')
+
+    def __init__(self, name, value=0.0, min=0.0, max=1.0, is_quantized=False, parent=None):
+        Subject.__init__(self)
+        self._name = name
+        # like in Live, renaming (a macro) leaves the original name alone
+        self.original_name = name
+        self._value = value
+        self.min = min
+        self.max = max
+        self.default_value = value
+        self.is_quantized = is_quantized
+        self.is_enabled = True
+        self.state = 0
+        self.canonical_parent = parent
+
+    def __str__(self):
+        if self.is_quantized:
+            return u'%d' % self._value
+        return u'%.2f' % self._value
+
+
+class DeviceView(Subject):
+    selected_chain = observable('selected_chain')
+
+    def __init__(self):
+        Subject.__init__(self)
+        self._selected_chain = None
+
+
+class Device(Subject):
+    name = observable('name')
+    parameters = observable('parameters')
+    is_active = observable('is_active')
+
+    def __init__(self, name, class_name, num_parameters=12, parent=None, parameter_names=None):
+        Subject.__init__(self)
+        self._name = name
+        self.class_name = class_name
+        self.canonical_parent = parent
+        self._is_active = True
+        if parameter_names is None:
+            parameter_names = [u'%s %d' % (name, n + 1) for n in range(num_parameters)]
+        self._parameters = tuple([DeviceParameter(u'Device On', 1.0, is_quantized=True, parent=self)] +
+                                 [DeviceParameter(parameter_name, 0.5, parent=self)
+                                  for parameter_name in parameter_names])
+        self.view = DeviceView()
+        self.chosen_banks = {}
+
+    def store_chosen_bank(self, script_index, bank):
+        self.chosen_banks[script_index] = bank
+
+
+class Chain(Subject):
+    name = observable('name')
+    devices = observable('devices')
+    solo = observable('solo')
+    mute = observable('mute')
+
+    def __init__(self, name, parent=None):
+        Subject.__init__(self)
+        self._name = name
+        self._devices = ()
+        self._solo = False
+        self._mute = False
+        self.canonical_parent = parent
+
+
+class DrumChain(Chain):
+    pass
+
+
+class RackDevice(Device):
+    chains = observable('chains')
+
+    def __init__(self, name, class_name=u'AudioEffectGroupDevice', num_chains=2, chain_devices=1, parent=None,
+                 chain_class=Chain):
+        Device.__init__(self, name, class_name, parent=parent,
+                        parameter_names=[u'Macro %d' % (n + 1) for n in range(8)])
+        chains = []
+        for n in range(num_chains):
+            chain = chain_class(u'%s Chain %d' % (name, n + 1), parent=self)
+            chain.devices = tuple([Device(u'%s %d.%d' % (name, n + 1, d + 1), u'AudioEffect', parent=chain)
+                                   for d in range(chain_devices)])
+            chains.append(chain)
+        self._chains = tuple(chains)
+        self.view.selected_chain = self._chains[0] if self._chains else None
+
+
+class MixerDevice(Subject):
+
+    def __init__(self, num_sends):
+        Subject.__init__(self)
+        self.volume = DeviceParameter(u'Track Volume', 0.85, parent=self)
+        self.panning = DeviceParameter(u'Track Panning', 0.0, -1.0, 1.0, parent=self)
+        self.sends = tuple([DeviceParameter(u'Send %s' % chr(65 + n), 0.0, parent=self)
+                            for n in range(num_sends)])
+
+
+class TrackView(Subject):
+    selected_device = observable('selected_device')
+
+    def __init__(self, track):
+        Subject.__init__(self)
+        self._track = track
+        self._selected_device = None
+
+    def select_instrument(self):
+        return bool(self._track.devices)
+
+
+class Track(Subject):
+    name = observable('name')
+    mute = observable('mute')
+    solo = observable('solo')
+    arm = observable('arm')
+    devices = observable('devices')
+    output_meter_level = observable('output_meter_level')
+    output_meter_left = observable('output_meter_left')
+    output_meter_right = observable('output_meter_right')
+
+    def __init__(self, song, name, num_sends=2, can_be_armed=True):
+        Subject.__init__(self)
+        self.canonical_parent = song
+        self._name = name
+        self._mute = False
+        self._solo = False
+        self._arm = False
+        self._devices = ()
+        self._output_meter_level = 0.0
+        self._output_meter_left = 0.0
+        self._output_meter_right = 0.0
+        self.can_be_armed = can_be_armed
+        self.has_audio_output = True
+        self.mixer_device = MixerDevice(num_sends)
+        self.view = TrackView(self)
+        self.__data = {}
+
+    def get_data(self, key, default_value):
+        return self.__data.get(key, default_value)
+
+    def set_data(self, key, value):
+        self.__data[key] = value
+
+
+class Scene(Subject):
+
+    def __init__(self, name):
+        Subject.__init__(self)
+        self.name = name
+
+    def fire_as_selected(self):
+        pass
+
+
+class CuePoint(Subject):
+
+    def __init__(self, name, time):
+        Subject.__init__(self)
+        self.name = name
+        self.time = time
+
+
+class SongView(Subject):
+    selected_track = observable('selected_track')
+    selected_scene = observable('selected_scene')
+
+    def __init__(self, song):
+        Subject.__init__(self)
+        self._song = song
+        self._selected_track = None
+        self._selected_scene = None
+
+    def select_device(self, device, should_focus=True):
+        track = device
+        while track is not None and not isinstance(track, Track):
+            track = track.canonical_parent
+        if track is not None:
+            self.selected_track = track
+            track.view.selected_device = device
+        self._song.appointed_device = device
+
+
+class Song(Subject):
+    tracks = observable('tracks')
+    visible_tracks = observable('visible_tracks')
+    return_tracks = observable('return_tracks')
+    appointed_device = observable('appointed_device')
+    record_mode = observable('record_mode')
+    is_playing = observable('is_playing')
+    loop = observable('loop')
+    current_song_time = observable('current_song_time')
+    cue_points = observable('cue_points')
+
+    def __init__(self, num_tracks=8, num_returns=2, devices_per_track=3, num_scenes=8, parameter_names=None):
+        Subject.__init__(self)
+        self._record_mode = False
+        self._is_playing = False
+        self._loop = False
+        self._current_song_time = 0.0
+        self._appointed_device = None
+        self._cue_points = tuple([CuePoint(u'Locator %d' % n, n * 32.0) for n in range(1, 5)])
+        self.exclusive_arm = True
+        self.signature_numerator = 4
+        self.signature_denominator = 4
+        self.song_length = 4096.0
+        self.view = SongView(self)
+        self.master_track = Track(self, u'Master', num_sends=0, can_be_armed=False)
+        self._return_tracks = tuple([Track(self, u'%s-Return' % chr(65 + n), num_sends=num_returns,
+                                           can_be_armed=False) for n in range(num_returns)])
+        tracks = []
+        for n in range(num_tracks):
+            track = Track(self, u'%d-Track' % (n + 1), num_sends=num_returns)
+            devices = []
+            for d in range(devices_per_track):
+                if d == 1:
+                    devices.append(RackDevice(u'Rack %d' % (n + 1), parent=track))
+                else:
+                    class_name = u'OriginalSimpler' if d == 0 else u'Compressor2'
+                    devices.append(Device(u'Device %d.%d' % (n + 1, d + 1), class_name, parent=track,
+                                          parameter_names=(parameter_names or {}).get(class_name)))
+            track.devices = tuple(devices)
+            tracks.append(track)
+        self._tracks = tuple(tracks)
+        self._visible_tracks = self._tracks
+        self.scenes = tuple([Scene(u'Scene %d' % (n + 1)) for n in range(num_scenes)])
+        self.view.selected_scene = self.scenes[0]
+        self.view.selected_track = self._tracks[0] if self._tracks else self.master_track
+
+    def jump_by(self, beats):
+        self.current_song_time = min(max(0.0, self._current_song_time + beats), self.song_length)
+
+    def start_playing(self):
+        self.is_playing = True
+
+    def stop_playing(self):
+        self.is_playing = False
+
+    def stop_all_clips(self):
+        pass
+
+    def add_track(self, name=None):
+        track = Track(self, name or u'%d-Track' % (len(self._tracks) + 1),
+                      num_sends=len(self._return_tracks))
+        self._tracks = self._tracks + (track,)
+        self._visible_tracks = self._tracks
+        self.notify('tracks')
+        self.notify('visible_tracks')
+        return track
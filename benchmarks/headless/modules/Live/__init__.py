@@ -0,0 +1,63 @@
+u"""Stand-in for Live's embedded 'Live' module, for running the script headless.
+Only what the script uses is provided. MIDI map calls are recorded on the
+midi_map_handle (see MidiMapRecorder in benchmarks/headless/__init__.py).
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+
+class Application(object):
+
+    _application = None
+
+    @staticmethod
+    def get_application():
+        return Application._application
+
+
+class MidiMap(object):
+
+    class MapMode(object):
+        absolute = 0
+        absolute_14_bit = 1
+        relative_signed_bit = 2
+        relative_binary_offset = 3
+        relative_signed_bit2 = 4
+        relative_signed_twos_complement = 5
+        relative_smooth_signed_bit = 6
+        relative_smooth_binary_offset = 7
+        relative_smooth_signed_bit2 = 8
+        relative_smooth_signed_twos_complement = 9
+
+    class CCFeedbackRule(object):
+
+        def __init__(self):
+            self.cc_no = -1
+            self.channel = -1
+            self.delay_in_ms = 0
+            self.cc_value_map = ()
+
+    @staticmethod
+    def map_midi_cc(midi_map_handle, parameter, channel, cc_no, map_mode, avoid_takeover):
+        midi_map_handle.record('map_midi_cc', parameter, channel, cc_no, map_mode)
+        return True
+
+    @staticmethod
+    def map_midi_cc_with_feedback_map(midi_map_handle, parameter, channel, cc_no, map_mode, feedback_rule,
+                                      avoid_takeover):
+        midi_map_handle.record('map_midi_cc_with_feedback_map', parameter, channel, cc_no, map_mode,
+                               feedback_rule.cc_no)
+        return True
+
+    @staticmethod
+    def send_feedback_for_parameter(midi_map_handle, parameter):
+        midi_map_handle.record('send_feedback_for_parameter', parameter)
+
+    @staticmethod
+    def forward_midi_cc(script_handle, midi_map_handle, channel, cc_no):
+        midi_map_handle.record('forward_midi_cc', channel, cc_no)
+        return True
+
+    @staticmethod
+    def forward_midi_note(script_handle, midi_map_handle, channel, note):
+        midi_map_handle.record('forward_midi_note', channel, note)
+        return True
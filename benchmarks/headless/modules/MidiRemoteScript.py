@@ -0,0 +1,2 @@
+u"""Stand-in for Live's embedded 'MidiRemoteScript' module (unused by the script).
+"""
@@ -0,0 +1,22 @@
+u"""Stand-in for _Framework.Capabilities, just enough for get_capabilities().
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+CONTROLLER_ID_KEY = u'controller_id'
+PORTS_KEY = u'ports'
+NOTES_CC = u'NotesCc'
+SCRIPT = u'Script'
+SYNC = u'Sync'
+REMOTE = u'Remote'
+
+
+def controller_id(vendor_id, product_ids, model_name):
+    return {u'vendor_id': vendor_id, u'product_ids': product_ids, u'model_name': model_name}
+
+
+def inport(props=[]):
+    return {u'direction': u'in', u'props': props}
+
+
+def outport(props=[]):
+    return {u'direction': u'out', u'props': props}
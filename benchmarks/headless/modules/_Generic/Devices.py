@@ -0,0 +1,35 @@
+u"""Stand-in for _Generic.Devices, with a few of Live's stock parameter banks.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+DEVICE_DICT = {
+    u'AudioEffectGroupDevice': ((u'Macro 1', u'Macro 2', u'Macro 3', u'Macro 4', u'Macro 5', u'Macro 6',
+                                 u'Macro 7', u'Macro 8'),),
+    u'Compressor2': ((u'Threshold', u'Ratio', u'Attack', u'Release', u'Model', u'Knee', u'Dry/Wet',
+                      u'Output Gain'),),
+    u'AutoFilter': ((u'Filter Type', u'Frequency', u'Resonance', u'Env. Modulation', u'LFO Amount',
+                     u'LFO Frequency', u'LFO Phase', u'Dry/Wet'),),
+    u'OriginalSimpler': ((u'Ve Attack', u'Ve Decay', u'Ve Sustain', u'Ve Release', u'Filter Freq',
+                          u'Filter Res', u'Transpose', u'Volume'),
+                         (u'Fe Attack', u'Fe Decay', u'Fe Sustain', u'Fe Release', u'Fe < Env',
+                          u'LFO Rate', u'LFO Amount', u'Pan')),
+}
+BANK_NAME_DICT = {
+    u'OriginalSimpler': (u'Amplitude', u'Filter'),
+}
+
+
+def get_parameter_by_name(device, name):
+    for parameter in device.parameters:
+        if parameter.original_name == name:
+            return parameter
+    return None
+
+
+def number_of_parameter_banks(device):
+    if device is not None:
+        if device.class_name in DEVICE_DICT:
+            return len(DEVICE_DICT[device.class_name])
+        param_count = len(device.parameters)
+        return param_count // 8 + (1 if param_count % 8 else 0)
+    return 0
@@ -0,0 +1,17 @@
+u"""Stand-in for _Generic.util.DeviceAppointer.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+
+class DeviceAppointer(object):
+
+    def __init__(self, song=None, appointed_device_setter=None):
+        self._song = song
+        self._appointed_device_setter = appointed_device_setter
+        self._song.add_appointed_device_listener(self._on_appointed_device_changed)
+
+    def disconnect(self):
+        self._song.remove_appointed_device_listener(self._on_appointed_device_changed)
+
+    def _on_appointed_device_changed(self):
+        self._appointed_device_setter(self._song.appointed_device)
@@ -0,0 +1,9 @@
+u"""Stand-in for past.utils from the 'future' package bundled with Live.
+"""
+from __future__ import absolute_import, division
+
+
+def old_div(a, b):
+    if isinstance(a, int) and isinstance(b, int):
+        return a // b
+    return a / b
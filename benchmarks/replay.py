@@ -0,0 +1,120 @@
+u"""Replay benchmark: drives the script headless through a scripted session of
+MIDI input and song changes, on sets of different sizes, and reports the time
+spent per callback and the MIDI sent to the controller.
+
+Run from the repository root:
+    python benchmarks/replay.py [--tracks 8 100 1000] [--rounds 50]
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import headless
+from headless.model import Song
+
+
+DEFAULT_TRACK_COUNTS = (8, 100, 1000)
+DEFAULT_ROUNDS = 50
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def build_song(num_tracks, num_returns):
+    devices = headless.script_module('EffectController')
+    parameter_names = {}
+    for class_name, banks in devices.DEVICE_DICT.items():
+        names = []
+        for bank in banks:
+            names.extend([name for name in bank if name not in names])
+        parameter_names[class_name] = names
+    return Song(num_tracks=num_tracks, num_returns=num_returns, parameter_names=parameter_names)
+
+
+def run_round(session, rng, consts):
+    song = session.song
+    tracks = song.tracks
+    track = tracks[rng.randrange(len(tracks))]
+
+    # Select a track and a device in Live, like clicking around with the mouse
+    session.mutate(u'select_track', setattr, song.view, u'selected_track', track)
+    session.mutate(u'select_device', song.view.select_device, track.devices[rng.randrange(len(track.devices))])
+    session.tick()
+
+    # Turn encoders: the parameters are mapped, so only the display follows
+    for strip in range(consts.NUM_CONTROLS_PER_ROW):
+        parameter = song.appointed_device.parameters[1 + strip % (len(song.appointed_device.parameters) - 1)]
+        session.mutate(u'parameter_change', setattr, parameter, u'value', rng.random())
+        session.tick()
+
+    # Page through the device parameter banks and the mixer banks
+    session.press(consts.FX_DISPLAY_PAGE_UP, consts.CC_VAL_BUTTON_PRESSED)
+    session.press(consts.FX_DISPLAY_PAGE_DOWN, consts.CC_VAL_BUTTON_PRESSED)
+    for x in range(3):
+        session.press(consts.MX_DISPLAY_PAGE_UP, consts.CC_VAL_BUTTON_PRESSED)
+        session.tick()
+    for x in range(3):
+        session.press(consts.MX_DISPLAY_PAGE_DOWN, consts.CC_VAL_BUTTON_PRESSED)
+        session.tick()
+
+    # Cycle through the slider modes
+    for cc_no in consts.mx_select_button_ccs + [consts.MX_SELECT_LOWER_BUTTON_ROW, consts.MX_SELECT_SLIDER_ROW]:
+        session.press(cc_no, consts.CC_VAL_BUTTON_PRESSED)
+        session.tick()
+
+    # Mixer buttons of the strips
+    strip = rng.randrange(consts.NUM_CONTROLS_PER_ROW)
+    session.press(consts.MX_UPPER_BUTTON_ROW_BASE_CC + strip, consts.CC_VAL_BUTTON_PRESSED)
+    session.press(consts.MX_LOWER_BUTTON_ROW_BASE_CC + strip, consts.CC_VAL_BUTTON_PRESSED)
+
+    # Song changes done in Live
+    session.mutate(u'rename_track', setattr, tracks[rng.randrange(min(len(tracks), 8))], u'name',
+                   u'Track %d' % rng.randrange(1000))
+    session.mutate(u'solo_track', setattr, tracks[rng.randrange(len(tracks))], u'solo', rng.random() > 0.5)
+    session.mutate(u'arm_track', setattr, tracks[rng.randrange(len(tracks))], u'arm', rng.random() > 0.5)
+    session.tick(2)
+
+
+def run(num_tracks, rounds, num_returns=4, seed=1):
+    rng = random.Random(seed)
+    consts = headless.script_module('consts')
+    session = headless.Session(song=build_song(num_tracks, num_returns))
+    session.handshake()
+    session.reset_stats()
+    for x in range(rounds):
+        run_round(session, rng, consts)
+    session.disconnect()
+    return session
+
+
+def report(num_tracks, session, rounds):
+    print(u'%d tracks, %d rounds: %d MIDI messages, %d bytes sent (%.0f bytes per round)' % (
+        num_tracks, rounds, len(session.c_instance.sent_midi), session.midi_bytes_sent(),
+        session.midi_bytes_sent() / float(rounds)))
+    print(u'  %-20s %8s %10s %10s %10s' % (u'callback', u'calls', u'mean us', u'p99 us', u'max us'))
+    for name in sorted(session.timings):
+        times = [t * 1000000.0 for t in session.timings[name]]
+        print(u'  %-20s %8d %10.1f %10.1f %10.1f' % (name, len(times), sum(times) / len(times),
+                                                     percentile(times, 0.99), max(times)))
+    print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(u'--tracks', type=int, nargs='+', default=list(DEFAULT_TRACK_COUNTS))
+    parser.add_argument(u'--rounds', type=int, default=DEFAULT_ROUNDS)
+    args = parser.parse_args(argv)
+    for num_tracks in args.tracks:
+        session = run(num_tracks, args.rounds)
+        report(num_tracks, session, args.rounds)
+
+
+if __name__ == '__main__':
+    main()
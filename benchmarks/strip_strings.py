@@ -0,0 +1,115 @@
+u"""Micro-benchmark for the display strip abbreviation.
+
+Compares the memoised StripAbbreviator with the former per-call implementation
+of DisplayController.__generate_strip_string on a corpus of typical Live
+parameter names and values, and checks that both produce the same strips.
+
+Run from the repository root: python benchmarks/strip_strings.py
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+import importlib
+import os
+import sys
+import timeit
+import types
+
+
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_script_module(name):
+    u"""Imports a module of the script without running its __init__ (which needs
+    Live).
+    """
+    if 'RemoteSL_98' not in sys.modules:
+        package = types.ModuleType('RemoteSL_98')
+        package.__path__ = [SCRIPT_DIR]
+        sys.modules['RemoteSL_98'] = package
+    return importlib.import_module('RemoteSL_98.' + name)
+
+
+consts = load_script_module('consts')
+StripAbbreviator = load_script_module('StripAbbreviator').StripAbbreviator
+
+
+def legacy_generate_strip_string(display_string):
+    NUM_CHARS_PER_DISPLAY_STRIP = consts.NUM_CHARS_PER_DISPLAY_STRIP
+    if not display_string:
+        return u' ' * NUM_CHARS_PER_DISPLAY_STRIP
+    if len(display_string.strip()) > NUM_CHARS_PER_DISPLAY_STRIP - 1 and display_string.endswith(u'dB') and display_string.find(u'.') != -1:
+        display_string = display_string[:-2]
+    if len(display_string) > NUM_CHARS_PER_DISPLAY_STRIP - 1:
+        for um in [u' ', u'i', u'o', u'u', u'e', u'a']:
+            while len(display_string) > NUM_CHARS_PER_DISPLAY_STRIP - 1 and display_string.rfind(um, 1) != -1:
+                um_pos = display_string.rfind(um, 1)
+                display_string = display_string[:um_pos] + display_string[um_pos + 1:]
+    else:
+        display_string = display_string.center(NUM_CHARS_PER_DISPLAY_STRIP - 1)
+    ret = u''
+    for i in range(NUM_CHARS_PER_DISPLAY_STRIP - 1):
+        if ord(display_string[i]) > 127 or ord(display_string[i]) < 0:
+            ret += u' '
+        else:
+            ret += display_string[i]
+    ret += u' '
+    return ret
+
+
+PARAMETER_NAMES = [
+    u'Device On', u'Algorithm', u'Osc-A On', u'Osc-A Coarse', u'Osc-A Fine',
+    u'Osc-A Level', u'Osc-A Wave', u'Ae Attack', u'Ae Decay', u'Ae Sustain',
+    u'Ae Release', u'Filter Freq', u'Filter Res', u'Filter Type',
+    u'Fe Amount', u'LFO Rate', u'LFO Amount', u'Pitch Env Amount',
+    u'Transpose', u'Spread', u'Tone', u'Volume', u'Dry/Wet', u'Feedback',
+    u'Decay Time', u'Predelay', u'Room Size', u'Stereo Image',
+    u'High Cut Freq', u'Low Cut Freq', u'Threshold', u'Ratio',
+    u'Attack', u'Release', u'Output Gain', u'Knee', u'Lookahead',
+    u'1 Filter On A', u'1 Frequency A', u'1 Gain A', u'1 Resonance A',
+    u'Osc 1 Position', u'Osc 1 Transp', u'Osc 1 Detune', u'Sub Gain',
+    u'Macro 1', u'Macro 2', u'Chain Selector', u'Pan', u'Send A',
+    u'Bass Drum', u'Snare Röll', u'Hi-Hat ÖPEN', u'',
+]
+PARAMETER_VALUES = [
+    u'0.0 dB', u'-6.0 dB', u'-12.0 dB', u'-inf dB', u'-24.5 dB', u'C',
+    u'50L', u'12R', u'100 %', u'0.00 %', u'1.00 kHz', u'20.0 kHz',
+    u'440 Hz', u'12 st', u'-7 st', u'0 ct', u'1.20 ms', u'250 ms',
+    u'1.50 s', u'On', u'Off', u'Sine', u'Saw D', u'1/16', u'4.00 : 1',
+]
+TRACK_NAMES = [u'%d-Audio' % n for n in range(1, 17)] + \
+    [u'%d-MIDI' % n for n in range(1, 17)] + \
+    [u'A-Reverb', u'B-Delay', u'Master', u'Drum Rack Group', u'Lead Synth Layer']
+CORPUS = PARAMETER_NAMES + PARAMETER_VALUES + TRACK_NAMES
+
+# Per tick the display shows 16 names and 16 values, most of them unchanged
+TICK = (CORPUS * 2)[:32]
+NUM_TICKS = 2000
+
+
+def main():
+    abbreviator = StripAbbreviator()
+    for display_string in CORPUS:
+        expected = legacy_generate_strip_string(display_string)
+        result = abbreviator.generate(display_string)
+        assert result == expected, (display_string, result, expected)
+    abbreviator.clear()
+
+    def run_legacy():
+        for display_string in TICK:
+            legacy_generate_strip_string(display_string)
+
+    def run_cached():
+        for display_string in TICK:
+            abbreviator.generate(display_string)
+
+    legacy = min(timeit.repeat(run_legacy, number=NUM_TICKS, repeat=5))
+    cached = min(timeit.repeat(run_cached, number=NUM_TICKS, repeat=5))
+    print(u'%d strings per tick, %d ticks' % (len(TICK), NUM_TICKS))
+    print(u'legacy: %8.2f us per tick' % (legacy / NUM_TICKS * 1e6))
+    print(u'cached: %8.2f us per tick' % (cached / NUM_TICKS * 1e6))
+    print(u'speedup: %.1fx (hits %d, misses %d)' %
+          (legacy / cached, abbreviator.hits, abbreviator.misses))
+
+
+if __name__ == '__main__':
+    main()
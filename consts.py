@@ -13,33 +13,22 @@ SL_MIDI_CHANNEL = 0
 CC_VAL_BUTTON_PRESSED = 1
 CC_VAL_BUTTON_RELEASED = 0
 ABLETON_PID = 4
-WELCOME_SYSEX_MESSAGE = (240,
-                         0,
-                         32,
-                         41,
-                         3,
-                         3,
-                         18,
-                         0,
-                         ABLETON_PID,
-                         0,
-                         1,
-                         1,
-                         247)
-GOOD_BYE_SYSEX_MESSAGE = (240,
-                          0,
-                          32,
-                          41,
-                          3,
-                          3,
-                          18,
-                          0,
-                          ABLETON_PID,
-                          0,
-                          1,
-                          0,
-                          247)
+SL_SYSEX_HEADER = (240,
+                   0,
+                   32,
+                   41,
+                   3,
+                   3,
+                   18,
+                   0,
+                   ABLETON_PID,
+                   0)
+SYSEX_END = (247,)
+WELCOME_SYSEX_MESSAGE = SL_SYSEX_HEADER + (1, 1) + SYSEX_END
+GOOD_BYE_SYSEX_MESSAGE = SL_SYSEX_HEADER + (1, 0) + SYSEX_END
+DISPLAY_TEXT_SYSEX_HEADER = SL_SYSEX_HEADER + (2, 1)
 ALL_LEDS_OFF_MESSAGE = (CC_STATUS + SL_MIDI_CHANNEL, 78, 0)
+LOCK_ENQUIRY_MESSAGE = (CC_STATUS + SL_MIDI_CHANNEL, 103, 1)
 NUM_CHARS_PER_DISPLAY_STRIP = 9
 NUM_CHARS_PER_DISPLAY_LINE = NUM_CHARS_PER_DISPLAY_STRIP * NUM_CONTROLS_PER_ROW
 
@@ -161,6 +150,61 @@ FX_UPPER_BUTTON_ROW_SNAPSHOTS = True
 FX_LOWER_BUTTON_ROW_DEVICE = True
 FX_LOWER_BUTTON_ROW_DEVICE_ALL = False
 FX_LOWER_BUTTON_ROW_DEVICE_CHILDS = True
+# Page through Operator with the banks of OperatorBanks.py (instead of the
+# stock banks, or all parameters with FX_ENCODER_MORE_PARAMETERS)
+FX_OPERATOR_BANKS = True
+
+# Only write the changed parts of a display row, when that is shorter
+DISPLAY_PARTIAL_UPDATES = True
+# Display sysex is sent after all LED messages of a tick, at most this many
+# bytes per tick (a complete display row is 88 bytes)
+DISPLAY_SYSEX_BYTES_PER_TICK = 176
+
+# Collect timing stats of the callbacks from Live, written to Stats.txt on
+# disconnect, or when all buttons of the combo are held down (while
+# INSTRUMENTATION is on, these buttons only act when released on their own)
+INSTRUMENTATION = False
+INSTRUMENTATION_DUMP_COMBO = (MX_SELECT_SLIDER_ROW, MX_SELECT_UPPER_BUTTON_ROW)
+
+# Log.txt: messages below LOG_LEVEL are dropped, the file is rotated when it
+# gets bigger than LOG_MAX_BYTES
+LOG_DEBUG = 10
+LOG_INFO = 20
+LOG_WARNING = 30
+LOG_ERROR = 40
+LOG_LEVEL = LOG_INFO
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+# Holding rewind/forward moves the song position SCRUB_START_SPEED beats per
+# second, accelerating along SCRUB_CURVE ('CONSTANT', 'LINEAR' or
+# 'EXPONENTIAL') to SCRUB_TOP_SPEED within SCRUB_ACCELERATION_TIME seconds.
+# On release the position snaps to the next bar or locator in the direction
+# of the scrub ('BAR', 'LOCATOR' or None)
+SCRUB_START_SPEED = 10.0
+SCRUB_TOP_SPEED = 160.0
+SCRUB_ACCELERATION_TIME = 3.0
+SCRUB_CURVE = 'EXPONENTIAL'
+SCRUB_SNAP = None
+
+# Show the output meters of the mixer tracks on the lower button LEDs (instead
+# of the select/arm state): lit above the signal level until it falls below
+# the off level, blinking for a while after the clip level was reached.
+# MX_METER_SOURCE is 'LEVEL' (output_meter_level) or 'STEREO' (the louder one
+# of output_meter_left/right, twice the reads)
+MX_METERS = False
+MX_METER_SOURCE = 'LEVEL'
+MX_METER_TRACKS_PER_TICK = 4
+MX_METER_LEDS_PER_TICK = 4
+MX_METER_SIGNAL_ON_LEVEL = 0.5
+MX_METER_SIGNAL_OFF_LEVEL = 0.4
+MX_METER_CLIP_LEVEL = 0.92
+MX_METER_CLIP_HOLD_TICKS = 20
+MX_METER_BLINK_TICKS = 2
+
+# Let several RemoteSLs in Live's control surface list act as one mixer: the
+# second one shows the 8 tracks after the ones of the first one, and so on
+LINK_SCRIPT_INSTANCES = False
 
 if not MX_DISPLAY_PAGE_DEVICE_CHILDS:
     mx_ccs += mx_display_button_ccs
@@ -0,0 +1,116 @@
+u"""Builds OperatorBanks.py from OperatorParameters.xlsx.
+
+The spreadsheet lists Operator's parameters in the order of device.parameters
+(row 1 is 'Device On', index 0). The banks below pick 8 of them each, by name;
+this script resolves the names to their positions, so the remote script can
+take the parameters straight from device.parameters without any name lookups.
+
+Run from the repository root after changing the spreadsheet or the banks:
+    python tools/build_operator_banks.py
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+import io
+import os
+import sys
+import zipfile
+from xml.etree import ElementTree
+
+
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPREADSHEET = os.path.join(SCRIPT_DIR, 'OperatorParameters.xlsx')
+OUTPUT = os.path.join(SCRIPT_DIR, 'OperatorBanks.py')
+SPREADSHEET_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+
+def oscillator_banks(osc):
+    envelope = osc + u'e'
+    return [(u'Osc ' + osc, [u'Osc-%s Level' % osc, u'%s Coarse' % osc, u'%s Fine' % osc,
+                             u'%s Fix On' % osc, u'%s Fix Freq' % osc, u'Osc-%s Wave' % osc,
+                             u'Osc-%s Feedb' % osc, u'Osc-%s Lev < Vel' % osc]),
+            (u'Env ' + osc, [u'%s Attack' % envelope, u'%s Decay' % envelope, u'%s Sustain' % envelope,
+                             u'%s Release' % envelope, u'%s Init' % envelope, u'%s Peak' % envelope,
+                             u'%s Mode' % envelope, u'%s Loop' % envelope])]
+
+
+BANKS = [(u'Global', [u'Algorithm', u'Volume', u'Tone', u'Transpose',
+                      u'Spread', u'Panorama', u'Time', u'Glide Time'])] + \
+    oscillator_banks(u'A') + oscillator_banks(u'B') + oscillator_banks(u'C') + oscillator_banks(u'D') + \
+    [(u'Filter', [u'Filter On', u'Filter Type', u'Filter Freq', u'Filter Res',
+                  u'Filter Drive', u'Filter Morph', u'Filt < Vel', u'Filt < Key']),
+     (u'Filter Env', [u'Fe Amount', u'Fe Attack', u'Fe Decay', u'Fe Sustain',
+                      u'Fe Release', u'Fe Init', u'Fe Peak', u'Fe End']),
+     (u'LFO', [u'LFO On', u'LFO Type', u'LFO Rate', u'LFO Range',
+               u'LFO Amt', u'LFO Sync', u'LFO Dst B', u'Filt < LFO']),
+     (u'LFO Env', [u'Le Attack', u'Le Decay', u'Le Sustain', u'Le Release',
+                   u'Le Init', u'Le Peak', u'Le End', u'Le Mode']),
+     (u'Pitch Env', [u'Pe On', u'Pe Amount', u'Pe Attack', u'Pe Decay',
+                     u'Pe Sustain', u'Pe Release', u'Pe Init', u'Pe Peak']),
+     (u'Shaper / Misc', [u'Shaper Type', u'Shaper Drive', u'Shaper Mix', u'Pan < Key',
+                         u'Pan < Rnd', u'PB Range', u'Glide On', u'Time < Key'])]
+
+
+def read_parameter_names(path):
+    u"""Returns the strings of the first column of the first sheet, in order.
+    """
+    with zipfile.ZipFile(path) as workbook:
+        shared_strings = [u''.join([text.text or u'' for text in item.iter(SPREADSHEET_NS + 't')])
+                          for item in ElementTree.fromstring(workbook.read('xl/sharedStrings.xml'))]
+        sheet = ElementTree.fromstring(workbook.read('xl/worksheets/sheet1.xml'))
+    names = []
+    for cell in sheet.iter(SPREADSHEET_NS + 'c'):
+        if not cell.get('r').startswith('A'):
+            continue
+        value = cell.find(SPREADSHEET_NS + 'v')
+        if cell.get('t') == 's':
+            names.append(shared_strings[int(value.text)].strip())
+        else:
+            names.append(value.text.strip())
+    return names
+
+
+def resolve_banks(parameter_names, banks):
+    positions = dict([(name, index) for index, name in reversed(list(enumerate(parameter_names)))])
+    resolved = []
+    for bank_name, names in banks:
+        assert len(names) == 8, u'bank %s must have 8 parameters' % bank_name
+        missing = [name for name in names if name not in positions]
+        assert not missing, u'bank %s: unknown parameters %s' % (bank_name, u', '.join(missing))
+        resolved.append((bank_name, [positions[name] for name in names], names))
+    return resolved
+
+
+def generate(parameter_names, resolved):
+    out = io.StringIO()
+    out.write(u'# Generated by tools/build_operator_banks.py from OperatorParameters.xlsx, do not edit.\n')
+    out.write(u'from __future__ import absolute_import, print_function, unicode_literals\n\n')
+    out.write(u"OPERATOR_CLASS_NAME = u'Operator'\n")
+    out.write(u'OPERATOR_PARAMETER_COUNT = %d\n\n' % len(parameter_names))
+    out.write(u'# The indices into device.parameters of the parameters of each bank\n')
+    out.write(u'OPERATOR_BANKS = (\n')
+    for bank_name, indices, names in resolved:
+        out.write(u'    (%s),  # %s: %s\n' % (u', '.join([str(index) for index in indices]),
+                                            bank_name, u', '.join(names)))
+    out.write(u')\n\n')
+    out.write(u'# The original names of the parameters of each bank, to check the indices\n')
+    out.write(u'OPERATOR_BANK_PARAMETER_NAMES = (\n')
+    for bank_name, indices, names in resolved:
+        out.write(u'    (%s),\n' % u', '.join([u"u'%s'" % name for name in names]))
+    out.write(u')\n\n')
+    out.write(u'OPERATOR_BANK_NAMES = (\n')
+    for bank_name, indices, names in resolved:
+        out.write(u"    u'%s',\n" % bank_name)
+    out.write(u')\n')
+    return out.getvalue()
+
+
+def main():
+    parameter_names = read_parameter_names(SPREADSHEET)
+    source = generate(parameter_names, resolve_banks(parameter_names, BANKS))
+    with io.open(OUTPUT, 'w', encoding='utf-8', newline='\n') as output:
+        output.write(source)
+    print(u'wrote %s: %d banks of %d parameters' % (OUTPUT, len(BANKS), len(parameter_names)))
+
+
+if __name__ == '__main__':
+    sys.exit(main())